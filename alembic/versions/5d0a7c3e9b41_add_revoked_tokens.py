@@ -0,0 +1,32 @@
+"""add revoked tokens
+
+Revision ID: 5d0a7c3e9b41
+Revises: e91a5c3f7b28
+Create Date: 2026-10-18 14:22:41.318207
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d0a7c3e9b41'
+down_revision = 'e91a5c3f7b28'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('revoked_tokens',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('token_digest', sa.String(length=64), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('token_digest')
+    )
+    op.create_index(op.f('ix_revoked_tokens_expires_at'), 'revoked_tokens', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_revoked_tokens_expires_at'), table_name='revoked_tokens')
+    op.drop_table('revoked_tokens')
@@ -0,0 +1,54 @@
+"""add patient search indexes
+
+Revision ID: 7c1e4a9b2d10
+Revises: 56362e0e622d
+Create Date: 2026-10-18 09:12:41.208311
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c1e4a9b2d10'
+down_revision = '56362e0e622d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.create_index('ix_patients_name_trgm', 'patients', ['name'], unique=False,
+                        postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+        op.create_index('ix_patients_phone_trgm', 'patients', ['phone'], unique=False,
+                        postgresql_using='gin', postgresql_ops={'phone': 'gin_trgm_ops'})
+    elif dialect == 'sqlite':
+        op.execute("""CREATE VIRTUAL TABLE IF NOT EXISTS patients_fts USING fts5(
+            name, phone, content='patients', content_rowid='id', tokenize='trigram'
+        )""")
+        op.execute("""CREATE TRIGGER IF NOT EXISTS patients_fts_ai AFTER INSERT ON patients BEGIN
+            INSERT INTO patients_fts(rowid, name, phone) VALUES (new.id, new.name, new.phone);
+        END""")
+        op.execute("""CREATE TRIGGER IF NOT EXISTS patients_fts_ad AFTER DELETE ON patients BEGIN
+            INSERT INTO patients_fts(patients_fts, rowid, name, phone) VALUES ('delete', old.id, old.name, old.phone);
+        END""")
+        op.execute("""CREATE TRIGGER IF NOT EXISTS patients_fts_au AFTER UPDATE OF name, phone ON patients BEGIN
+            INSERT INTO patients_fts(patients_fts, rowid, name, phone) VALUES ('delete', old.id, old.name, old.phone);
+            INSERT INTO patients_fts(rowid, name, phone) VALUES (new.id, new.name, new.phone);
+        END""")
+        # Index the patients that already exist
+        op.execute("INSERT INTO patients_fts(patients_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.drop_index('ix_patients_phone_trgm', table_name='patients')
+        op.drop_index('ix_patients_name_trgm', table_name='patients')
+    elif dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS patients_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS patients_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS patients_fts_ai")
+        op.execute("DROP TABLE IF EXISTS patients_fts")
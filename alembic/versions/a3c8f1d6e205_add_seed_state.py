@@ -0,0 +1,29 @@
+"""add seed state
+
+Revision ID: a3c8f1d6e205
+Revises: 5d0a7c3e9b41
+Create Date: 2026-10-18 16:05:12.447931
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3c8f1d6e205'
+down_revision = '5d0a7c3e9b41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('seed_state',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('applied_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('seed_state')
@@ -0,0 +1,29 @@
+"""add dashboard counters
+
+Revision ID: b4f2d8e61a37
+Revises: 7c1e4a9b2d10
+Create Date: 2026-10-18 10:03:17.554902
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4f2d8e61a37'
+down_revision = '7c1e4a9b2d10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Rows are seeded lazily by crud.get_dashboard_stats on first use
+    op.create_table('dashboard_counters',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('value', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('dashboard_counters')
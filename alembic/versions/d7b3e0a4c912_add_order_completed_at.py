@@ -0,0 +1,29 @@
+"""add order completed_at
+
+Revision ID: d7b3e0a4c912
+Revises: a3c8f1d6e205
+Create Date: 2026-10-18 18:12:40.118305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7b3e0a4c912'
+down_revision = 'a3c8f1d6e205'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('test_orders', sa.Column('completed_at', sa.DateTime(), nullable=True))
+    # The completion time of existing orders wasn't recorded; the order time is the
+    # closest thing there is
+    op.execute("UPDATE test_orders SET completed_at = ordered_at WHERE status = 'completed'")
+    op.create_index('ix_test_orders_completed_at_id', 'test_orders', ['completed_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_test_orders_completed_at_id', table_name='test_orders')
+    op.drop_column('test_orders', 'completed_at')
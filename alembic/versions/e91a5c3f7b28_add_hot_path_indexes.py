@@ -0,0 +1,38 @@
+"""add hot path indexes
+
+Revision ID: e91a5c3f7b28
+Revises: b4f2d8e61a37
+Create Date: 2026-10-18 11:26:09.731540
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e91a5c3f7b28'
+down_revision = 'b4f2d8e61a37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_patients_phone'), 'patients', ['phone'], unique=False)
+    op.create_index('ix_patients_created_at_id', 'patients', ['created_at', 'id'], unique=False)
+    op.create_index('ix_tests_category_id_name', 'tests', ['category_id', 'name'], unique=False)
+    op.create_index(op.f('ix_test_orders_patient_id'), 'test_orders', ['patient_id'], unique=False)
+    op.create_index('ix_test_orders_ordered_at_id', 'test_orders', ['ordered_at', 'id'], unique=False)
+    op.create_index('ix_test_orders_status_ordered_at_id', 'test_orders', ['status', 'ordered_at', 'id'], unique=False)
+    op.create_index(op.f('ix_test_order_items_order_id'), 'test_order_items', ['order_id'], unique=False)
+    op.create_index(op.f('ix_test_order_items_test_id'), 'test_order_items', ['test_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_test_order_items_test_id'), table_name='test_order_items')
+    op.drop_index(op.f('ix_test_order_items_order_id'), table_name='test_order_items')
+    op.drop_index('ix_test_orders_status_ordered_at_id', table_name='test_orders')
+    op.drop_index('ix_test_orders_ordered_at_id', table_name='test_orders')
+    op.drop_index(op.f('ix_test_orders_patient_id'), table_name='test_orders')
+    op.drop_index('ix_tests_category_id_name', table_name='tests')
+    op.drop_index('ix_patients_created_at_id', table_name='patients')
+    op.drop_index(op.f('ix_patients_phone'), table_name='patients')
@@ -1,3 +1,6 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
@@ -16,6 +19,22 @@ SECRET_KEY = os.getenv("SECRET_KEY", "lms-production-key-change-this")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 hours
 
+# bcrypt off the event loop.
+# A bcrypt check takes a few hundred ms of CPU; the bcrypt library releases the GIL
+# while hashing, so a small thread pool keeps other requests moving during a burst
+# of logins. At most PASSWORD_WORKERS hashes run at once and PASSWORD_QUEUE_SIZE more
+# may wait for a thread; past that, logins are refused rather than queued.
+# PASSWORD_WORKERS=0 hashes inline on the event loop.
+PASSWORD_WORKERS = int(os.getenv("PASSWORD_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_QUEUE_SIZE = int(os.getenv("PASSWORD_QUEUE_SIZE", "16"))
+
+class PasswordQueueFull(Exception):
+    """Raised when PASSWORD_WORKERS + PASSWORD_QUEUE_SIZE hashes are already in flight"""
+
+_password_pool: Optional[ThreadPoolExecutor] = None
+_password_pool_lock = threading.Lock()
+_hashes_in_flight = 0
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against hashed password"""
     return pwd_context.verify(plain_password, hashed_password)
@@ -27,6 +46,37 @@ def get_password_hash(password: str) -> str:
         password = password.encode('utf-8')[:72].decode('utf-8', errors='ignore')
     return pwd_context.hash(password)
 
+def get_password_pool() -> ThreadPoolExecutor:
+    global _password_pool
+    with _password_pool_lock:
+        if _password_pool is None:
+            _password_pool = ThreadPoolExecutor(max_workers=PASSWORD_WORKERS, thread_name_prefix="bcrypt")
+        return _password_pool
+
+def shutdown_password_pool():
+    global _password_pool
+    with _password_pool_lock:
+        if _password_pool is not None:
+            _password_pool.shutdown(wait=False, cancel_futures=True)
+            _password_pool = None
+
+async def _run_hash(func, *args):
+    global _hashes_in_flight
+    if PASSWORD_WORKERS <= 0:
+        return func(*args)
+    if _hashes_in_flight >= PASSWORD_WORKERS + PASSWORD_QUEUE_SIZE:
+        raise PasswordQueueFull()
+    _hashes_in_flight += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_password_pool(), func, *args)
+    finally:
+        _hashes_in_flight -= 1
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the bcrypt thread pool"""
+    return await _run_hash(verify_password, plain_password, hashed_password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create JWT access token"""
     to_encode = data.copy()
@@ -38,13 +88,17 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def verify_token(token: str):
-    """Verify JWT token"""
+def decode_token(token: str) -> Optional[dict]:
+    """Verify the JWT signature and expiry and return its claims"""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            return None
-        return username
     except JWTError:
-        return None
\ No newline at end of file
+        return None
+    if payload.get("sub") is None:
+        return None
+    return payload
+
+def verify_token(token: str):
+    """Verify JWT token"""
+    payload = decode_token(token)
+    return payload["sub"] if payload else None
\ No newline at end of file
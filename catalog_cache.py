@@ -0,0 +1,97 @@
+import os
+import threading
+import time
+from types import MappingProxyType
+from typing import Callable, Mapping, NamedTuple, Optional, Tuple
+
+# In-process cache of the test catalog (categories + tests).
+# Catalog writes in crud.py call invalidate() which bumps the version, so the
+# worker that made the change rebuilds on its next read. Other gunicorn workers
+# cannot see that bump, so snapshots also expire after CATALOG_CACHE_TTL seconds.
+CATALOG_CACHE_TTL = float(os.getenv("CATALOG_CACHE_TTL", "60"))
+
+class CategoryEntry(NamedTuple):
+    id: int
+    name: str
+
+class TestEntry(NamedTuple):
+    id: int
+    name: str
+    price: float
+    unit: Optional[str]
+    reference_range: Optional[str]
+    category_id: int
+    category: CategoryEntry
+
+class CatalogSnapshot(NamedTuple):
+    version: int
+    loaded_at: float
+    categories: Tuple[CategoryEntry, ...]
+    tests: Tuple[TestEntry, ...]
+    tests_by_category: Mapping[int, Tuple[TestEntry, ...]]
+
+def build_snapshot(version: int, categories, tests) -> CatalogSnapshot:
+    """Freeze ORM categories/tests into a sorted, immutable snapshot"""
+    category_entries = {c.id: CategoryEntry(c.id, c.name) for c in categories}
+    test_entries = sorted(
+        (TestEntry(t.id, t.name, t.price, t.unit, t.reference_range, t.category_id,
+                   category_entries[t.category_id])
+         for t in tests),
+        key=lambda t: (t.category.name, t.name, t.id)
+    )
+    grouped = {}
+    for test in test_entries:
+        grouped.setdefault(test.category_id, []).append(test)
+    return CatalogSnapshot(
+        version=version,
+        loaded_at=time.monotonic(),
+        categories=tuple(sorted(category_entries.values(), key=lambda c: c.name)),
+        tests=tuple(test_entries),
+        tests_by_category=MappingProxyType({k: tuple(v) for k, v in grouped.items()})
+    )
+
+_lock = threading.Lock()
+_version = 0
+_snapshot: Optional[CatalogSnapshot] = None
+_hits = 0
+_misses = 0
+
+def _is_fresh(snapshot: Optional[CatalogSnapshot]) -> bool:
+    return (snapshot is not None and snapshot.version == _version
+            and time.monotonic() - snapshot.loaded_at < CATALOG_CACHE_TTL)
+
+def get(loader: Callable[[int], CatalogSnapshot]) -> CatalogSnapshot:
+    """Return the cached snapshot, calling loader(version) to rebuild it when stale"""
+    global _snapshot, _hits, _misses
+    snapshot = _snapshot
+    if _is_fresh(snapshot):
+        _hits += 1
+        return snapshot
+
+    # The load runs without the lock: under AsyncSession.run_sync its queries hand
+    # the event loop to other requests mid-load, and one of those blocking on a
+    # thread lock here would freeze the loop for good. Concurrent misses may each
+    # load once; the lock only guards the swap.
+    _misses += 1
+    version = _version
+    loaded = loader(version)
+    with _lock:
+        # Don't replace a snapshot of a newer version stored meanwhile. An
+        # invalidate() that races the load leaves _version ahead of the snapshot,
+        # so it is simply rebuilt on the next read
+        if _snapshot is None or loaded.version >= _snapshot.version:
+            _snapshot = loaded
+    return loaded
+
+def invalidate():
+    global _version
+    with _lock:
+        _version += 1
+
+def stats() -> dict:
+    return {
+        "hits": _hits,
+        "misses": _misses,
+        "version": _version,
+        "cached_tests": len(_snapshot.tests) if _snapshot else 0,
+    }
@@ -0,0 +1,154 @@
+import csv
+import glob
+import hashlib
+import os
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+
+import catalog_cache
+from database import engine
+from models import SeedState, Test, TestCategory
+
+# Seeding of the test catalog from the CSV files in data/catalog.
+# Rows are {"category", "test_name", "parameter", "normal_range"} dicts; a test is
+# stored as "<test_name> - <parameter>" and is identified by (category_id, name), as
+# it always has been. Everything runs in one transaction: one query for the existing
+# categories, one for the existing tests of those categories, then multi-row INSERTs
+# of whatever is missing. Running it again inserts nothing.
+#
+# seed_catalog_files() also stores a sha256 of the files in seed_state and does
+# nothing at all while the files still hash the same, so container starts with
+# RUN_SEED_ALL=true only read the files and make one query.
+CATALOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "catalog")
+CATALOG_SEED_NAME = "test_catalog"
+
+# Rows per INSERT statement, to stay under SQLite's bound-parameter limit
+INSERT_BATCH_SIZE = 200
+
+class CategorySummary(NamedTuple):
+    name: str
+    created: bool
+    rows: int
+    inserted: int
+
+    @property
+    def existing(self) -> int:
+        return self.rows - self.inserted
+
+def full_test_name(row: dict) -> str:
+    return f"{row['test_name']} - {row['parameter']}"
+
+def _insert(conn: Connection, table):
+    # ON CONFLICT DO NOTHING where the database has it, so a seeder racing another
+    # one skips rows instead of failing the whole transaction
+    if conn.dialect.name == "postgresql":
+        return postgresql.insert(table).on_conflict_do_nothing()
+    if conn.dialect.name == "sqlite":
+        return sqlite.insert(table).on_conflict_do_nothing()
+    return table.insert()
+
+def _insert_rows(conn: Connection, table, rows: List[dict]):
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        conn.execute(_insert(conn, table).values(rows[start:start + INSERT_BATCH_SIZE]))
+
+def _category_ids(conn: Connection, names: Iterable[str]) -> Dict[str, int]:
+    table = TestCategory.__table__
+    return {
+        name: category_id
+        for category_id, name in conn.execute(select(table.c.id, table.c.name).where(table.c.name.in_(list(names))))
+    }
+
+def catalog_files(directory: str = CATALOG_DIR) -> List[str]:
+    return sorted(glob.glob(os.path.join(directory, "*.csv")))
+
+def catalog_hash(paths: List[str]) -> str:
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(os.path.basename(path).encode("utf-8") + b"\0")
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(65536), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+def iter_catalog_rows(paths: List[str]) -> Iterator[dict]:
+    """Catalog rows from CSV files, one at a time"""
+    for path in paths:
+        with open(path, newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
+
+def seed_catalog(rows: Iterable[dict], price: float = 0.0) -> List[CategorySummary]:
+    """Insert the catalog rows that are not in the database yet, per category"""
+    with engine.begin() as conn:
+        summary = _seed(conn, rows, price)
+    if any(s.inserted or s.created for s in summary):
+        catalog_cache.invalidate()
+    return summary
+
+def seed_catalog_files(paths: Optional[List[str]] = None, force: bool = False) -> Optional[List[CategorySummary]]:
+    """Seed the catalog files unless they are unchanged since the last run (then None)"""
+    paths = catalog_files() if paths is None else paths
+    content_hash = catalog_hash(paths)
+    state = SeedState.__table__
+    with engine.begin() as conn:
+        stored = conn.execute(
+            select(state.c.content_hash).where(state.c.name == CATALOG_SEED_NAME)
+        ).scalar()
+        if stored == content_hash and not force:
+            return None
+        summary = _seed(conn, iter_catalog_rows(paths), 0.0)
+        values = {"content_hash": content_hash, "applied_at": datetime.utcnow()}
+        if stored is None:
+            conn.execute(state.insert().values(name=CATALOG_SEED_NAME, **values))
+        else:
+            conn.execute(state.update().where(state.c.name == CATALOG_SEED_NAME).values(**values))
+    if any(s.inserted or s.created for s in summary):
+        catalog_cache.invalidate()
+    return summary
+
+def _seed(conn: Connection, rows: Iterable[dict], price: float) -> List[CategorySummary]:
+    by_category: Dict[str, Dict[str, dict]] = {}
+    for row in rows:
+        # Later duplicates of a test in the data are ignored, like the old scripts did
+        by_category.setdefault(row["category"], {}).setdefault(full_test_name(row), row)
+    if not by_category:
+        return []
+
+    tests = Test.__table__
+    category_ids = _category_ids(conn, by_category)
+    missing_categories = [name for name in by_category if name not in category_ids]
+    if missing_categories:
+        _insert_rows(conn, TestCategory.__table__, [{"name": name} for name in missing_categories])
+        category_ids = _category_ids(conn, by_category)
+
+    existing = set(conn.execute(
+        select(tests.c.category_id, tests.c.name).where(tests.c.category_id.in_(category_ids.values()))
+    ))
+
+    new_tests = []
+    summary = []
+    for category, category_rows in by_category.items():
+        category_id = category_ids[category]
+        missing = [
+            {"name": name, "price": price, "reference_range": row["normal_range"], "category_id": category_id}
+            for name, row in category_rows.items()
+            if (category_id, name) not in existing
+        ]
+        new_tests.extend(missing)
+        summary.append(CategorySummary(category, category in missing_categories, len(category_rows), len(missing)))
+    _insert_rows(conn, tests, new_tests)
+    return summary
+
+def print_summary(summary: List[CategorySummary]):
+    width = max([len(s.name) for s in summary] + [len("Category")])
+    print(f"{'Category':<{width}}  {'rows':>5}  {'inserted':>8}  {'existing':>8}")
+    print("-" * (width + 29))
+    for s in summary:
+        created = "  (new category)" if s.created else ""
+        print(f"{s.name:<{width}}  {s.rows:>5}  {s.inserted:>8}  {s.existing:>8}{created}")
+    print("-" * (width + 29))
+    print(f"{'Total':<{width}}  {sum(s.rows for s in summary):>5}  "
+          f"{sum(s.inserted for s in summary):>8}  {sum(s.existing for s in summary):>8}")
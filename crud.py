@@ -1,9 +1,65 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
-from models import Patient, Test, TestCategory, TestOrder, TestOrderItem, AdminUser
-from schemas import PatientCreate, PatientUpdate, TestCreate, TestUpdate, TestCategoryCreate, TestOrderCreate, TestOrderItemUpdate
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import case, func, select, text, tuple_
+from sqlalchemy.exc import IntegrityError
+from models import Patient, Test, TestCategory, TestOrder, TestOrderItem, AdminUser, DashboardCounter, RevokedToken
+from schemas import BulkOrder, PatientCreate, PatientUpdate, TestCreate, TestUpdate, TestCategoryCreate, TestOrderCreate, TestOrderItemUpdate
 from auth import get_password_hash
-from typing import List, Optional
+from search import search_patients
+import catalog_cache
+from typing import Dict, List, Optional
+from datetime import datetime
+import base64
+from collections import Counter
+import os
+
+# Keep dashboard totals in the dashboard_counters table instead of counting rows on every load
+DASHBOARD_COUNTERS = os.getenv("DASHBOARD_COUNTERS", "false").lower() == "true"
+
+# Keyset pagination helpers
+def encode_cursor(sort_value: datetime, row_id: int) -> str:
+    raw = f"{sort_value.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: Optional[str]):
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        sort_value, row_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(sort_value), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+def _keyset_page(query, sort_column, id_column, limit: int, after: Optional[str] = None, before: Optional[str] = None):
+    # Newest first, ordered on (sort_column, id) so the position is unique and a
+    # page is always an index range scan from the cursor, never an OFFSET skip.
+    key = tuple_(sort_column, id_column)
+    after_key, before_key = decode_cursor(after), decode_cursor(before)
+
+    if before_key:
+        rows = (query.filter(key > tuple_(*before_key))
+                .order_by(sort_column.asc(), id_column.asc())
+                .limit(limit + 1).all())
+        has_prev = len(rows) > limit
+        rows = list(reversed(rows[:limit]))
+        has_next = True
+    else:
+        if after_key:
+            query = query.filter(key < tuple_(*after_key))
+        rows = (query.order_by(sort_column.desc(), id_column.desc())
+                .limit(limit + 1).all())
+        has_next = len(rows) > limit
+        rows = rows[:limit]
+        has_prev = after_key is not None
+
+    def cursor_for(row):
+        return encode_cursor(getattr(row, sort_column.key), getattr(row, id_column.key))
+
+    return {
+        "items": rows,
+        "next_cursor": cursor_for(rows[-1]) if rows and has_next else None,
+        "prev_cursor": cursor_for(rows[0]) if rows and has_prev else None,
+    }
 
 # Admin User CRUD
 def create_admin_user(db: Session, username: str, password: str):
@@ -17,15 +73,37 @@ def create_admin_user(db: Session, username: str, password: str):
 def get_admin_user(db: Session, username: str):
     return db.query(AdminUser).filter(AdminUser.username == username).first()
 
+# Token revocation
+def revoke_token(db: Session, token_digest: str, expires_at: datetime):
+    # Entries are only needed until the token would have expired anyway
+    db.query(RevokedToken).filter(RevokedToken.expires_at < datetime.utcnow()).delete(synchronize_session=False)
+    db.add(RevokedToken(token_digest=token_digest, expires_at=expires_at))
+    try:
+        db.commit()
+    except IntegrityError:
+        # Already revoked (logged out twice)
+        db.rollback()
+
+def get_revoked_tokens(db: Session):
+    """Digests and expiry times of all unexpired revocations"""
+    return (db.query(RevokedToken.token_digest, RevokedToken.expires_at)
+            .filter(RevokedToken.expires_at > datetime.utcnow())
+            .all())
+
 # Patient CRUD
-def get_patients(db: Session, skip: int = 0, limit: int = 100, search: str = None):
-    query = db.query(Patient)
+def get_patients(db: Session, limit: int = 100, search: str = None):
     if search:
-        query = query.filter(or_(
-            Patient.name.contains(search),
-            Patient.phone.contains(search)
-        ))
-    return query.offset(skip).limit(limit).all()
+        return search_patients(db, search, limit)
+    return (db.query(Patient)
+            .order_by(Patient.created_at.desc(), Patient.id.desc())
+            .limit(limit).all())
+
+def get_patients_page(db: Session, limit: int = 100, search: str = None,
+                      after: Optional[str] = None, before: Optional[str] = None):
+    # Search results are ranked by relevance, so they come back as a single page
+    if search:
+        return {"items": search_patients(db, search, limit), "next_cursor": None, "prev_cursor": None}
+    return _keyset_page(db.query(Patient), Patient.created_at, Patient.id, limit, after, before)
 
 def get_patient(db: Session, patient_id: int):
     return db.query(Patient).filter(Patient.id == patient_id).first()
@@ -33,6 +111,7 @@ def get_patient(db: Session, patient_id: int):
 def create_patient(db: Session, patient: PatientCreate):
     db_patient = Patient(**patient.dict())
     db.add(db_patient)
+    _bump_counters(db, total_patients=1)
     db.commit()
     db.refresh(db_patient)
     return db_patient
@@ -50,6 +129,7 @@ def delete_patient(db: Session, patient_id: int):
     db_patient = db.query(Patient).filter(Patient.id == patient_id).first()
     if db_patient:
         db.delete(db_patient)
+        _bump_counters(db, total_patients=-1)
         db.commit()
     return db_patient
 
@@ -61,6 +141,7 @@ def create_test_category(db: Session, category: TestCategoryCreate):
     db_category = TestCategory(**category.dict())
     db.add(db_category)
     db.commit()
+    catalog_cache.invalidate()
     db.refresh(db_category)
     return db_category
 
@@ -71,6 +152,14 @@ def get_tests(db: Session, category_id: Optional[int] = None):
         query = query.filter(Test.category_id == category_id)
     return query.all()
 
+def get_catalog(db: Session) -> catalog_cache.CatalogSnapshot:
+    """Cached, sorted snapshot of all categories and tests"""
+    def load(version: int):
+        categories = db.query(TestCategory).all()
+        tests = db.query(Test).all()
+        return catalog_cache.build_snapshot(version, categories, tests)
+    return catalog_cache.get(load)
+
 def get_test(db: Session, test_id: int):
     return db.query(Test).filter(Test.id == test_id).first()
 
@@ -78,6 +167,7 @@ def create_test(db: Session, test: TestCreate):
     db_test = Test(**test.dict())
     db.add(db_test)
     db.commit()
+    catalog_cache.invalidate()
     db.refresh(db_test)
     return db_test
 
@@ -87,6 +177,7 @@ def update_test(db: Session, test_id: int, test_update: TestUpdate):
         for key, value in test_update.dict(exclude_unset=True).items():
             setattr(db_test, key, value)
         db.commit()
+        catalog_cache.invalidate()
         db.refresh(db_test)
     return db_test
 
@@ -95,45 +186,228 @@ def delete_test(db: Session, test_id: int):
     if db_test:
         db.delete(db_test)
         db.commit()
+        catalog_cache.invalidate()
     return db_test
 
 # Test Order CRUD
-def get_orders(db: Session, skip: int = 0, limit: int = 100, status: Optional[str] = None):
-    query = db.query(TestOrder)
+def _orders_query(db: Session, status: Optional[str] = None, with_items: bool = False):
+    query = db.query(TestOrder).options(joinedload(TestOrder.patient))
+    if with_items:
+        query = query.options(selectinload(TestOrder.items))
     if status:
         query = query.filter(TestOrder.status == status)
-    return query.offset(skip).limit(limit).all()
+    return query
+
+def get_orders(db: Session, limit: int = 100, status: Optional[str] = None):
+    return (_orders_query(db, status)
+            .order_by(TestOrder.ordered_at.desc(), TestOrder.id.desc())
+            .limit(limit).all())
+
+def get_orders_page(db: Session, limit: int = 100, status: Optional[str] = None,
+                    after: Optional[str] = None, before: Optional[str] = None, with_items: bool = False):
+    return _keyset_page(_orders_query(db, status, with_items), TestOrder.ordered_at, TestOrder.id, limit, after, before)
 
 def get_order(db: Session, order_id: int):
     return db.query(TestOrder).filter(TestOrder.id == order_id).first()
 
-def create_order(db: Session, order: TestOrderCreate):
-    # Calculate total amount
-    tests = db.query(Test).filter(Test.id.in_(order.test_ids)).all()
-    total_amount = sum(test.price for test in tests)
+def _order_graph_options(include_category: bool = True):
+    # Patient is many-to-one, so it rides along on the order row via a JOIN.
+    # Items are one-to-many and go through a single SELECT ... WHERE order_id IN (...)
+    # with each item's test (and optionally category) joined into that same query.
+    item_test = selectinload(TestOrder.items).joinedload(TestOrderItem.test)
+    if include_category:
+        item_test = item_test.joinedload(Test.category)
+    return [joinedload(TestOrder.patient), item_test]
+
+def get_order_graph(db: Session, order_id: int, include_category: bool = True):
+    """Load an order with patient, items and tests in two queries regardless of item count"""
+    return (
+        db.query(TestOrder)
+        .options(*_order_graph_options(include_category))
+        .filter(TestOrder.id == order_id)
+        .first()
+    )
+
+def get_order_graphs(db: Session, order_ids: Optional[List[int]] = None,
+                     date_from: Optional[datetime] = None, date_to: Optional[datetime] = None,
+                     status: Optional[str] = "completed", limit: Optional[int] = None):
+    """Bulk version of get_order_graph for print runs: same two queries for any number of orders
+
+    date_from and date_to select orders by when they were completed, not ordered."""
+    query = db.query(TestOrder).options(*_order_graph_options(include_category=False))
+    if order_ids is not None:
+        query = query.filter(TestOrder.id.in_(order_ids))
+    if date_from:
+        query = query.filter(TestOrder.completed_at >= date_from)
+    if date_to:
+        query = query.filter(TestOrder.completed_at < date_to)
+    if status:
+        query = query.filter(TestOrder.status == status)
+    query = query.order_by(TestOrder.ordered_at, TestOrder.id)
+    if limit:
+        query = query.limit(limit)
+    return query.all()
+
+class InvalidTestIds(ValueError):
+    """Raised when an order lists a test twice or a test id that doesn't exist"""
+
+class InvalidOrderBatch(ValueError):
+    """Raised by create_orders_bulk with one {"index", "error"} entry per rejected order"""
+
+    def __init__(self, errors: List[dict]):
+        super().__init__(f"{len(errors)} orders rejected")
+        self.errors = errors
+
+ORDER_STATUSES = ("pending", "completed")
+
+def _check_test_ids(test_ids: List[int]):
+    if not test_ids:
+        raise InvalidTestIds("An order needs at least one test")
+    duplicates = sorted(test_id for test_id, count in Counter(test_ids).items() if count > 1)
+    if duplicates:
+        raise InvalidTestIds(f"Tests listed more than once: {', '.join(map(str, duplicates))}")
+
+def price_tests(db: Session, test_ids: List[int]) -> float:
+    """Total price of the tests, checking every id once in a single query"""
+    _check_test_ids(test_ids)
+    found, total = db.query(func.count(Test.id), func.coalesce(func.sum(Test.price), 0.0)).filter(
+        Test.id.in_(test_ids)
+    ).one()
+    if found != len(test_ids):
+        known = {test_id for (test_id,) in db.query(Test.id).filter(Test.id.in_(test_ids))}
+        unknown = [test_id for test_id in test_ids if test_id not in known]
+        raise InvalidTestIds(f"Unknown tests: {', '.join(map(str, unknown))}")
+    return total
+
+def create_order(db: Session, order: TestOrderCreate) -> int:
+    """Insert the order and its items in one transaction and return the new order id"""
+    total_amount = price_tests(db, order.test_ids)
     
-    # Create order
-    db_order = TestOrder(
+    # Core inserts: the id comes back from the INSERT itself (RETURNING on Postgres,
+    # lastrowid on SQLite) and the items go in as one executemany
+    order_id = db.execute(TestOrder.__table__.insert().values(
         patient_id=order.patient_id,
         total_amount=total_amount,
         status=order.status,
+        completed_at=datetime.utcnow() if order.status == "completed" else None,
         referred_by=getattr(order, 'referred_by', None)
-    )
-    db.add(db_order)
-    db.flush()  # Get the order ID
-    
-    # Create order items
-    for test_id in order.test_ids:
-        db_item = TestOrderItem(order_id=db_order.id, test_id=test_id)
-        db.add(db_item)
+    )).inserted_primary_key[0]
+    db.execute(TestOrderItem.__table__.insert(), [
+        {"order_id": order_id, "test_id": test_id} for test_id in order.test_ids
+    ])
     
+    _bump_counters(db, total_orders=1, **{f"{order.status}_orders": 1})
     db.commit()
-    db.refresh(db_order)
-    return db_order
+    return order_id
+
+def _begin_immediate(db: Session):
+    # SQLite: take the database write lock now (BEGIN IMMEDIATE) instead of at the
+    # first write, so nothing the caller reads next can change before it commits;
+    # other writers wait out the busy timeout meanwhile. The sqlite3 driver only opens
+    # a transaction at the first INSERT/UPDATE/DELETE, so a caller that has only read
+    # so far is still outside one.
+    if db.bind.dialect.name == "sqlite":
+        db.execute(text("BEGIN IMMEDIATE"))
+
+def _allocate_ids(db: Session, table, count: int) -> List[int]:
+    # Postgres hands out ids from the table's sequence, so they never collide. Other
+    # databases (SQLite) continue from the highest id, so the caller must hold the
+    # write lock (_begin_immediate) before allocating.
+    if count == 0:
+        return []
+    if db.bind.dialect.name == "postgresql":
+        return list(db.execute(
+            select(func.nextval(func.pg_get_serial_sequence(table.name, "id")))
+            .select_from(func.generate_series(1, count))
+        ).scalars())
+    start = db.execute(select(func.coalesce(func.max(table.c.id), 0))).scalar() + 1
+    return list(range(start, start + count))
+
+def _bulk_order_error(order: BulkOrder, prices: Dict[int, float], known_patients: set) -> Optional[str]:
+    if (order.patient_id is None) == (order.patient is None):
+        return "Give either patient_id or patient"
+    if order.patient_id is not None and order.patient_id not in known_patients:
+        return f"Unknown patient: {order.patient_id}"
+    if order.status not in ORDER_STATUSES:
+        return f"Status must be one of: {', '.join(ORDER_STATUSES)}"
+    try:
+        _check_test_ids(order.test_ids)
+    except InvalidTestIds as e:
+        return str(e)
+    unknown = [test_id for test_id in order.test_ids if test_id not in prices]
+    if unknown:
+        return f"Unknown tests: {', '.join(map(str, unknown))}"
+    return None
+
+def create_orders_bulk(db: Session, orders: List[BulkOrder]):
+    """Validate and insert a batch of orders in one transaction; (order ids, patient ids)
+
+    Every order is checked before anything is written, with one query for the
+    prices of all the tests and one for the referenced patients. If any order is
+    invalid, nothing is inserted and InvalidOrderBatch lists the problems. The
+    statement count doesn't grow with the number of orders."""
+    test_ids = {test_id for order in orders for test_id in order.test_ids}
+    prices = dict(db.query(Test.id, Test.price).filter(Test.id.in_(test_ids))) if test_ids else {}
+    patient_ids = {order.patient_id for order in orders if order.patient_id is not None}
+    known_patients = {
+        patient_id for (patient_id,) in db.query(Patient.id).filter(Patient.id.in_(patient_ids))
+    } if patient_ids else set()
+
+    errors = [
+        {"index": index, "error": error}
+        for index, order in enumerate(orders)
+        if (error := _bulk_order_error(order, prices, known_patients))
+    ]
+    if errors:
+        raise InvalidOrderBatch(errors)
+
+    # Ids are allocated up front so patients, orders and items can each go in as a
+    # single executemany, whatever the size of the batch
+    _begin_immediate(db)
+    new_patients = [order.patient for order in orders if order.patient_id is None]
+    new_patient_ids = iter(_allocate_ids(db, Patient.__table__, len(new_patients)))
+    order_ids = _allocate_ids(db, TestOrder.__table__, len(orders))
+    order_patient_ids = [
+        order.patient_id if order.patient_id is not None else next(new_patient_ids) for order in orders
+    ]
+    now = datetime.utcnow()
+    if new_patients:
+        db.execute(Patient.__table__.insert(), [
+            {"id": patient_id, **order.patient.dict()}
+            for order, patient_id in zip(orders, order_patient_ids) if order.patient_id is None
+        ])
+    db.execute(TestOrder.__table__.insert(), [
+        {
+            "id": order_id,
+            "patient_id": patient_id,
+            "total_amount": sum(prices[test_id] for test_id in order.test_ids),
+            "status": order.status,
+            "completed_at": now if order.status == "completed" else None,
+            "referred_by": order.referred_by,
+        }
+        for order, order_id, patient_id in zip(orders, order_ids, order_patient_ids)
+    ])
+    db.execute(TestOrderItem.__table__.insert(), [
+        {"order_id": order_id, "test_id": test_id}
+        for order, order_id in zip(orders, order_ids) for test_id in order.test_ids
+    ])
+
+    statuses = Counter(order.status for order in orders)
+    _bump_counters(
+        db,
+        total_patients=len(new_patients),
+        total_orders=len(orders),
+        **{f"{status}_orders": count for status, count in statuses.items()}
+    )
+    db.commit()
+    return order_ids, order_patient_ids
 
 def update_order_status(db: Session, order_id: int, status: str):
     db_order = db.query(TestOrder).filter(TestOrder.id == order_id).first()
     if db_order:
+        if db_order.status != status:
+            _bump_counters(db, **{f"{db_order.status}_orders": -1, f"{status}_orders": 1})
+            db_order.completed_at = datetime.utcnow() if status == "completed" else None
         db_order.status = status
         db.commit()
         db.refresh(db_order)
@@ -150,24 +424,133 @@ def update_order_item_result(db: Session, item_id: int, result_update: TestOrder
         db.refresh(db_item)
     return db_item
 
+def update_order_results(db: Session, order_id: int, results: Dict[int, TestOrderItemUpdate]):
+    """Apply result updates for many items of an order in one transaction; returns the changed item count"""
+    if not results:
+        return 0
+    current = db.query(TestOrderItem.id, TestOrderItem.result_value, TestOrderItem.result_notes).filter(
+        TestOrderItem.order_id == order_id,
+        TestOrderItem.id.in_(results.keys())
+    ).all()
+
+    # Same rules as update_order_item_result: a None field means "leave as is"
+    mappings = []
+    for item_id, result_value, result_notes in current:
+        update = results[item_id]
+        changes = {}
+        if update.result_value is not None and update.result_value != result_value:
+            changes["result_value"] = update.result_value
+        if update.result_notes is not None and update.result_notes != result_notes:
+            changes["result_notes"] = update.result_notes
+        if changes:
+            mappings.append({"id": item_id, **changes})
+
+    if mappings:
+        db.bulk_update_mappings(TestOrderItem, mappings)
+        db.commit()
+    return len(mappings)
+
 def delete_order(db: Session, order_id: int):
+    status = db.query(TestOrder.status).filter(TestOrder.id == order_id).scalar()
     # Delete order items first (due to foreign key constraints)
     db.query(TestOrderItem).filter(TestOrderItem.order_id == order_id).delete()
     # Delete the order
-    db.query(TestOrder).filter(TestOrder.id == order_id).delete()
+    if db.query(TestOrder).filter(TestOrder.id == order_id).delete():
+        _bump_counters(db, total_orders=-1, **{f"{status}_orders": -1})
     db.commit()
     return True
 
+# Result exports
+EXPORT_COLUMNS = (
+    "order_id", "ordered_at", "status", "referred_by",
+    "patient_id", "patient_name", "patient_age", "patient_gender", "patient_phone",
+    "category", "test_id", "test_name", "unit", "reference_range", "price",
+    "result_value", "result_notes",
+)
+
+def iter_order_results(db: Session, date_from: Optional[datetime] = None, date_to: Optional[datetime] = None,
+                       category_id: Optional[int] = None, status: Optional[str] = None, batch_size: int = 1000):
+    """Yield batches of flat order/item/test/patient rows, streamed from a server-side cursor"""
+    stmt = (
+        select(
+            TestOrder.id.label("order_id"), TestOrder.ordered_at, TestOrder.status, TestOrder.referred_by,
+            Patient.id.label("patient_id"), Patient.name.label("patient_name"), Patient.age.label("patient_age"),
+            Patient.gender.label("patient_gender"), Patient.phone.label("patient_phone"),
+            TestCategory.name.label("category"), Test.id.label("test_id"), Test.name.label("test_name"),
+            Test.unit, Test.reference_range, Test.price,
+            TestOrderItem.result_value, TestOrderItem.result_notes,
+        )
+        .select_from(TestOrderItem)
+        .join(TestOrder, TestOrderItem.order_id == TestOrder.id)
+        .join(Patient, TestOrder.patient_id == Patient.id)
+        .join(Test, TestOrderItem.test_id == Test.id)
+        .join(TestCategory, Test.category_id == TestCategory.id)
+        .order_by(TestOrder.ordered_at, TestOrder.id, TestOrderItem.id)
+    )
+    if date_from:
+        stmt = stmt.where(TestOrder.ordered_at >= date_from)
+    if date_to:
+        stmt = stmt.where(TestOrder.ordered_at < date_to)
+    if category_id:
+        stmt = stmt.where(Test.category_id == category_id)
+    if status:
+        stmt = stmt.where(TestOrder.status == status)
+
+    # stream_results makes psycopg2 use a named (server-side) cursor, so only one
+    # batch is ever held in memory
+    result = db.connection().execute(stmt.execution_options(stream_results=True))
+    for partition in result.partitions(batch_size):
+        yield partition
+
 # Dashboard stats
+COUNTER_NAMES = ("total_patients", "total_orders", "pending_orders", "completed_orders")
+
+def _bump_counters(db: Session, **deltas):
+    # Runs inside the caller's transaction, so counters commit or roll back with the row change.
+    # UPDATE ... SET value = value + n keeps concurrent writers from losing increments, and a
+    # CASE on the name bumps every counter a write touches in that one statement.
+    if not DASHBOARD_COUNTERS:
+        return
+    deltas = {name: delta for name, delta in deltas.items() if delta and name in COUNTER_NAMES}
+    if deltas:
+        db.query(DashboardCounter).filter(DashboardCounter.name.in_(deltas)).update(
+            {DashboardCounter.value: DashboardCounter.value + case(deltas, value=DashboardCounter.name)},
+            synchronize_session=False
+        )
+
+def _count_dashboard_stats(db: Session):
+    patients = db.query(func.count(Patient.id)).scalar_subquery()
+    row = db.query(
+        patients,
+        func.count(TestOrder.id),
+        func.count(TestOrder.id).filter(TestOrder.status == "pending"),
+        func.count(TestOrder.id).filter(TestOrder.status == "completed"),
+    ).select_from(TestOrder).one()
+    return dict(zip(COUNTER_NAMES, row))
+
+def rebuild_dashboard_counters(db: Session):
+    """Recount dashboard totals from the tables and store them as counters"""
+    # Counted and stored under a lock that keeps _bump_counters waiting, so a write
+    # made meanwhile is either in the count or bumps the stored value afterwards.
+    # Existing rows are updated in place rather than replaced, so a bump that was
+    # waiting on them still finds them.
+    if db.bind.dialect.name == "postgresql":
+        db.execute(text(f"LOCK TABLE {DashboardCounter.__tablename__} IN EXCLUSIVE MODE"))
+    _begin_immediate(db)
+    stats = _count_dashboard_stats(db)
+    existing = {name for (name,) in db.query(DashboardCounter.name).filter(DashboardCounter.name.in_(stats))}
+    if existing:
+        db.query(DashboardCounter).filter(DashboardCounter.name.in_(existing)).update(
+            {DashboardCounter.value: case(stats, value=DashboardCounter.name)}, synchronize_session=False
+        )
+    db.add_all(DashboardCounter(name=name, value=value) for name, value in stats.items() if name not in existing)
+    db.commit()
+    return stats
+
 def get_dashboard_stats(db: Session):
-    total_patients = db.query(Patient).count()
-    total_orders = db.query(TestOrder).count()
-    pending_orders = db.query(TestOrder).filter(TestOrder.status == "pending").count()
-    completed_orders = db.query(TestOrder).filter(TestOrder.status == "completed").count()
-    
-    return {
-        "total_patients": total_patients,
-        "total_orders": total_orders,
-        "pending_orders": pending_orders,
-        "completed_orders": completed_orders
-    }
\ No newline at end of file
+    if not DASHBOARD_COUNTERS:
+        return _count_dashboard_stats(db)
+    counters = dict(db.query(DashboardCounter.name, DashboardCounter.value).all())
+    if all(name in counters for name in COUNTER_NAMES):
+        return {name: counters[name] for name in COUNTER_NAMES}
+    return rebuild_dashboard_counters(db)
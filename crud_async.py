@@ -0,0 +1,55 @@
+import functools
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import crud
+
+# Awaitable versions of the crud.py functions for the async routes.
+# Each one runs the regular sync implementation through AsyncSession.run_sync, which
+# drives it on the async driver (asyncpg/aiosqlite) inside a greenlet: the query logic
+# stays in one place and database I/O yields to the event loop instead of blocking it.
+# Anything a template reads must be loaded eagerly, since lazy loads can't run once
+# the route has returned to the event loop.
+
+def _awaitable(func):
+    @functools.wraps(func)
+    async def wrapper(db: AsyncSession, *args, **kwargs):
+        return await db.run_sync(func, *args, **kwargs)
+    return wrapper
+
+# Admin User CRUD
+get_admin_user = _awaitable(crud.get_admin_user)
+
+# Patient CRUD
+get_patients = _awaitable(crud.get_patients)
+get_patients_page = _awaitable(crud.get_patients_page)
+get_patient = _awaitable(crud.get_patient)
+create_patient = _awaitable(crud.create_patient)
+update_patient = _awaitable(crud.update_patient)
+delete_patient = _awaitable(crud.delete_patient)
+
+# Test catalog CRUD
+get_catalog = _awaitable(crud.get_catalog)
+get_test_categories = _awaitable(crud.get_test_categories)
+create_test_category = _awaitable(crud.create_test_category)
+get_tests = _awaitable(crud.get_tests)
+get_test = _awaitable(crud.get_test)
+create_test = _awaitable(crud.create_test)
+update_test = _awaitable(crud.update_test)
+delete_test = _awaitable(crud.delete_test)
+
+# Test Order CRUD
+get_orders = _awaitable(crud.get_orders)
+get_orders_page = _awaitable(crud.get_orders_page)
+get_order = _awaitable(crud.get_order)
+get_order_graph = _awaitable(crud.get_order_graph)
+get_order_graphs = _awaitable(crud.get_order_graphs)
+create_order = _awaitable(crud.create_order)
+create_orders_bulk = _awaitable(crud.create_orders_bulk)
+update_order_status = _awaitable(crud.update_order_status)
+update_order_item_result = _awaitable(crud.update_order_item_result)
+update_order_results = _awaitable(crud.update_order_results)
+delete_order = _awaitable(crud.delete_order)
+
+# Dashboard stats
+get_dashboard_stats = _awaitable(crud.get_dashboard_stats)
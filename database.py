@@ -1,7 +1,15 @@
+import contextvars
 import os
-from sqlalchemy import create_engine
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
 from models import Base
+from search import ensure_search_index
 
 # Read database URL from environment (Render provides DATABASE_URL)
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./lms.db")
@@ -12,18 +20,188 @@ DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./lms.db")
 if DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
+# Connection pool settings. Each web worker has two pools (the sync engine and the
+# async one below), so a worker can hold up to 2 * (DB_POOL_SIZE + DB_MAX_OVERFLOW)
+# connections; keep GUNICORN_WORKERS times that under the server's connection limit.
+#
+# DB_POOL_SIZE       connections kept open (0 opens a new connection for every checkout)
+# DB_MAX_OVERFLOW    extra connections allowed under load, closed again when returned
+# DB_POOL_TIMEOUT    seconds to wait for a free connection before failing the request
+# DB_POOL_RECYCLE    seconds after which a connection is replaced (-1 never); keep it
+#                    below the server's idle timeout
+# DB_POOL_PRE_PING   test each connection on checkout and reconnect if it was dropped
+POOL_DEFAULTS = {
+    # Managed Postgres (Render) drops idle connections, so recycle and ping
+    "postgresql": {"size": 5, "overflow": 10, "timeout": 30, "recycle": 300, "pre_ping": True},
+    # A local file never drops a connection; pooling keeps SQLite's page cache warm
+    "sqlite": {"size": 5, "overflow": 10, "timeout": 30, "recycle": -1, "pre_ping": False},
+}
+
+def pool_settings(url: str, is_async: bool = False) -> dict:
+    """create_engine() pool arguments from DB_POOL_* settings, with per-backend defaults"""
+    backend = "sqlite" if url.startswith("sqlite") else "postgresql"
+    if backend == "sqlite" and (":memory:" in url or url.split("?")[0].rstrip("/").endswith(":")):
+        # In-memory databases live in their connection, keep SQLAlchemy's own pool
+        return {}
+    defaults = POOL_DEFAULTS[backend]
+    size = int(os.getenv("DB_POOL_SIZE", defaults["size"]))
+    if size <= 0:
+        return {"poolclass": NullPool}
+    settings = {
+        "pool_size": size,
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", defaults["overflow"])),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", defaults["timeout"])),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", defaults["recycle"])),
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", str(defaults["pre_ping"])).lower() == "true",
+    }
+    if backend == "sqlite":
+        # SQLAlchemy 1.4 doesn't pool SQLite file connections unless asked to
+        settings["poolclass"] = AsyncAdaptedQueuePool if is_async else QueuePool
+    return settings
+
 # Create engine. SQLite needs the check_same_thread connect arg.
 if DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+    engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False}, **pool_settings(DATABASE_URL))
 else:
-    engine = create_engine(DATABASE_URL)
+    engine = create_engine(DATABASE_URL, **pool_settings(DATABASE_URL))
+
+# SQLite settings for desktop installs, applied to every new connection.
+# SQLITE_PRAGMAS            false leaves SQLite's defaults alone
+# SQLITE_JOURNAL_MODE       WAL lets the other counters keep reading while one commits
+# SQLITE_SYNCHRONOUS        NORMAL fsyncs at WAL checkpoints instead of on every commit; a
+#                           power cut can lose the last commits but not corrupt the file
+# SQLITE_BUSY_TIMEOUT_MS    how long a writer waits for the lock before "database is locked"
+# SQLITE_CACHE_SIZE_MB      page cache per connection
+# SQLITE_MMAP_SIZE_MB       read the file through a memory map up to this size (0 off)
+# SQLITE_TEMP_STORE         MEMORY keeps temp tables and sorts off the disk
+SQLITE_PRAGMAS = {}
+if os.getenv("SQLITE_PRAGMAS", "true").lower() == "true":
+    SQLITE_PRAGMAS = {
+        "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+        "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+        "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "10000")),
+        "cache_size": -int(float(os.getenv("SQLITE_CACHE_SIZE_MB", "64")) * 1024),
+        "mmap_size": int(float(os.getenv("SQLITE_MMAP_SIZE_MB", "256")) * 1024 * 1024),
+        "temp_store": os.getenv("SQLITE_TEMP_STORE", "MEMORY"),
+    }
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
 
 # Create session maker
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for the web routes (aiosqlite / asyncpg), so queries don't block the event loop.
+# Scripts, Alembic and startup keep using the sync engine above.
+def to_async_url(url: str) -> str:
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
+
+ASYNC_DATABASE_URL = to_async_url(DATABASE_URL)
+async_connect_args = {}
+if ASYNC_DATABASE_URL.startswith("postgresql+asyncpg") and "sslmode=" in ASYNC_DATABASE_URL:
+    # asyncpg takes libpq's sslmode values, but as the "ssl" connect argument
+    base, _, query = ASYNC_DATABASE_URL.partition("?")
+    params = []
+    for param in query.split("&"):
+        if param.startswith("sslmode="):
+            async_connect_args["ssl"] = param.split("=", 1)[1]
+        elif param:
+            params.append(param)
+    ASYNC_DATABASE_URL = base + ("?" + "&".join(params) if params else "")
+
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL, connect_args=async_connect_args, **pool_settings(DATABASE_URL, is_async=True)
+)
+
+if DATABASE_URL.startswith("sqlite") and SQLITE_PRAGMAS:
+    for _engine in (engine, async_engine.sync_engine):
+        event.listen(_engine, "connect", set_sqlite_pragmas)
+
+# expire_on_commit=False: templates read attributes after the route has committed,
+# and an async session cannot lazy-load them at that point
+AsyncSessionLocal = sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+# Per-request SQL statistics.
+# Every statement run on either engine while a collector is active (one per request,
+# see metrics.QueryStatsMiddleware) is counted and timed. The same statement run
+# again and again with different parameters is reported as an N+1 pattern: usually
+# a lazy load inside a template loop, or a row-by-row write.
+#
+# SQL_STATS                 header: add an X-SQL-Stats response header (development)
+#                           log: one JSON line per request on the lms.sql logger
+#                           off: don't collect
+# SQL_STATS_STRICT          true: fail any request that shows an N+1 pattern (for tests)
+# SQL_N_PLUS_ONE_THRESHOLD  runs of one statement, with distinct parameters, that count as N+1
+SQL_STATS = os.getenv("SQL_STATS", "log").lower()
+SQL_STATS_STRICT = os.getenv("SQL_STATS_STRICT", "false").lower() == "true"
+SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "3"))
+
+class NPlusOneQuery(Exception):
+    """Raised in strict mode when a request repeats a statement per row"""
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self._parameters: Dict[str, set] = {}
+
+    def record(self, statement: str, parameters, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+        self._parameters.setdefault(statement, set()).add(repr(parameters))
+
+    def n_plus_one(self) -> List[dict]:
+        return [
+            {"statement": statement, "count": len(parameters)}
+            for statement, parameters in self._parameters.items()
+            if len(parameters) >= SQL_N_PLUS_ONE_THRESHOLD
+        ]
+
+_query_stats: contextvars.ContextVar[Optional[QueryStats]] = contextvars.ContextVar("query_stats", default=None)
+
+@contextmanager
+def collect_queries():
+    """Count and time the statements run inside the block (async sessions included)"""
+    stats = QueryStats()
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _query_stats.get() is not None:
+        context._query_started = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _query_stats.get()
+    if stats is not None:
+        started = getattr(context, "_query_started", None)
+        stats.record(statement, None if executemany else parameters,
+                     time.perf_counter() - started if started else 0.0)
+
+for _engine in (engine, async_engine.sync_engine):
+    event.listen(_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(_engine, "after_cursor_execute", _after_cursor_execute)
+
 # Create tables
 def create_tables():
     Base.metadata.create_all(bind=engine)
+    # create_all skips tables that already exist, so add indexes introduced since
+    # (desktop installs never run the Alembic migrations)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+    ensure_search_index(engine)
 
 # Dependency to get database session
 def get_db():
@@ -31,4 +209,8 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
\ No newline at end of file
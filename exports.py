@@ -0,0 +1,41 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Iterable, Iterator
+
+from crud import EXPORT_COLUMNS
+
+# Formatting for the streaming result exports.
+# crud.iter_order_results yields batches of rows from a server-side cursor; each
+# batch is turned into one text chunk here, so the export never holds more than
+# one batch in memory regardless of how many orders are in the range.
+
+def _value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+def csv_chunks(batches: Iterable, header: bool = True) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_COLUMNS)
+        yield buffer.getvalue()
+    for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_value(v) for v in row] for row in batch)
+        yield buffer.getvalue()
+
+def jsonl_chunks(batches: Iterable) -> Iterator[str]:
+    for batch in batches:
+        yield "".join(
+            json.dumps({column: _value(v) for column, v in zip(EXPORT_COLUMNS, row)}, separators=(",", ":")) + "\n"
+            for row in batch
+        )
+
+FORMATS = {
+    "csv": (csv_chunks, "text/csv"),
+    "jsonl": (jsonl_chunks, "application/x-ndjson"),
+}
@@ -0,0 +1,18 @@
+import os
+import shutil
+
+# gunicorn loads this file automatically from the working directory.
+
+# Each worker writes its Prometheus samples here and /metrics adds them up
+# (see metrics.py). Set before the workers fork so they all inherit it.
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/lms_metrics")
+
+def on_starting(server):
+    # Samples left over from a previous run would be counted again
+    path = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path)
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,81 @@
+import os
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Hashable, Optional, Tuple
+
+# Brute-force throttling for /login, checked before any password hash is computed.
+# Each client IP may make LOGIN_IP_ATTEMPTS attempts and each (IP, username) pair may
+# have LOGIN_USER_FAILURES failed attempts within LOGIN_THROTTLE_WINDOW seconds; a
+# successful login clears the pair's failures. Failures are counted per address so
+# that junk logins from one place can't lock the real user out of their account
+# everywhere else. The counters live in the worker
+# process, so with several gunicorn workers a client gets up to that many times the
+# limit before every worker is refusing it.
+LOGIN_IP_ATTEMPTS = int(os.getenv("LOGIN_IP_ATTEMPTS", "30"))
+LOGIN_USER_FAILURES = int(os.getenv("LOGIN_USER_FAILURES", "5"))
+LOGIN_THROTTLE_WINDOW = float(os.getenv("LOGIN_THROTTLE_WINDOW", "300"))
+# Keys kept per counter; the stalest are dropped first when an attacker rotates them
+LOGIN_THROTTLE_KEYS = 10000
+
+# Behind a reverse proxy (Render's load balancer, nginx) the connecting address is
+# the proxy's, and gunicorn's UvicornWorker only honours X-Forwarded-For from
+# forwarded_allow_ips (127.0.0.1 by default), so every client would share one IP
+# counter. TRUSTED_PROXY_HOPS is the number of proxies in front of the app that
+# append to X-Forwarded-For; the client is the entry that many places from the
+# right. Entries further left come from the client and are never used, so they
+# can't be forged to dodge the limit. 0 (the default) uses the connecting address.
+TRUSTED_PROXY_HOPS = int(os.getenv("TRUSTED_PROXY_HOPS", "0"))
+
+_lock = threading.Lock()
+_ip_attempts: Dict[str, Deque[float]] = {}
+_user_failures: Dict[Tuple[str, str], Deque[float]] = {}
+
+def _recent(counter: Dict[Hashable, Deque[float]], key: Hashable, now: float) -> Deque[float]:
+    times = counter.get(key)
+    if times is None:
+        if len(counter) >= LOGIN_THROTTLE_KEYS:
+            counter.pop(next(iter(counter)))
+        times = counter[key] = deque()
+    while times and times[0] <= now - LOGIN_THROTTLE_WINDOW:
+        times.popleft()
+    return times
+
+def client_ip(forwarded_for: Optional[str], peer: Optional[str]) -> str:
+    """The address a login attempt is counted under"""
+    if TRUSTED_PROXY_HOPS > 0 and forwarded_for:
+        hosts = [host.strip() for host in forwarded_for.split(",") if host.strip()]
+        # Fewer entries than proxies means the request didn't come through them
+        if len(hosts) >= TRUSTED_PROXY_HOPS:
+            return hosts[-TRUSTED_PROXY_HOPS]
+    return peer or "unknown"
+
+def _retry_after(times: Deque[float], now: float) -> float:
+    return max(1.0, times[0] + LOGIN_THROTTLE_WINDOW - now)
+
+def check(ip: str, username: str) -> Optional[float]:
+    """Count a login attempt; seconds to wait if it must be refused, else None"""
+    now = time.monotonic()
+    with _lock:
+        failures = _recent(_user_failures, (ip, username.lower()), now)
+        if len(failures) >= LOGIN_USER_FAILURES:
+            return _retry_after(failures, now)
+        attempts = _recent(_ip_attempts, ip, now)
+        if len(attempts) >= LOGIN_IP_ATTEMPTS:
+            return _retry_after(attempts, now)
+        attempts.append(now)
+    return None
+
+def failed(ip: str, username: str):
+    now = time.monotonic()
+    with _lock:
+        _recent(_user_failures, (ip, username.lower()), now).append(now)
+
+def succeeded(ip: str, username: str):
+    with _lock:
+        _user_failures.pop((ip, username.lower()), None)
+
+def reset():
+    with _lock:
+        _ip_attempts.clear()
+        _user_failures.clear()
@@ -1,36 +1,67 @@
+import hmac
+import logging
 import os
-from datetime import timedelta
+import tempfile
+import time
+from contextlib import asynccontextmanager, contextmanager
+from datetime import date, datetime, timedelta
 from typing import Optional
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
 from dotenv import load_dotenv
 from fastapi import FastAPI, Depends, HTTPException, Request, Form
-from fastapi.responses import HTMLResponse, RedirectResponse, Response
+from fastapi.responses import FileResponse, HTMLResponse, RedirectResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from sqlalchemy.orm import Session
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
+import catalog_cache
 import crud
+import crud_async
+import exports
+import login_throttle
+import metrics
+import pdf_cache
+import pdf_renderer
 import schemas
-from auth import verify_password, create_access_token, verify_token
-from database import get_db, create_tables
+import token_cache
+from auth import PasswordQueueFull, create_access_token, shutdown_password_pool, verify_password_async
+from database import SessionLocal, async_engine, engine, get_db, get_async_db, create_tables
 
 # Load environment variables
 load_dotenv()
 
-app = FastAPI(
-    title="Lab Management System",
-    docs_url=None,
-    redoc_url=None
-)
-
-# Mount static files
-app.mount("/static", StaticFiles(directory="static"), name="static")
-
-# Templates
-templates = Jinja2Templates(directory="templates")
-
-# Create database tables
-create_tables()
+logger = logging.getLogger("uvicorn.error")
+
+# Startup work is serialised between gunicorn workers with a file lock, so only the
+# first worker creates the schema and admin user and the rest find them in place
+STARTUP_LOCK_FILE = os.getenv("STARTUP_LOCK_FILE", os.path.join(tempfile.gettempdir(), "lms_startup.lock"))
+
+@contextmanager
+def startup_lock():
+    with open(STARTUP_LOCK_FILE, "a") as lock_file:
+        # No fcntl on Windows, where the desktop install runs a single process anyway
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def prepare_schema() -> bool:
+    """Create tables unless Alembic manages the schema; True if create_all ran"""
+    if inspect(engine).has_table("alembic_version"):
+        return False
+    create_tables()
+    return True
 
 # Initialize admin user
 def init_admin():
@@ -42,17 +73,110 @@ def init_admin():
         crud.create_admin_user(db, admin_username, admin_password)
     db.close()
 
-init_admin()
+def rebuild_dashboard_counters():
+    # Writes made while DASHBOARD_COUNTERS was off (or outside the app) don't bump the
+    # stored counters, so recount once per start rather than trusting them forever
+    db = SessionLocal()
+    try:
+        crud.rebuild_dashboard_counters(db)
+    finally:
+        db.close()
+
+def warm_caches():
+    from utils import report_env
+    
+    # Compile every page and report template, load the test catalog and let search
+    # detect its index, so the first requests don't pay for it
+    for env in (templates.env, report_env):
+        for name in env.list_templates():
+            env.get_template(name)
+    db = SessionLocal()
+    try:
+        crud.get_catalog(db)
+        crud.get_patients(db, limit=1, search="warm")
+    finally:
+        db.close()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    timings = {}
+    started = time.perf_counter()
+    
+    def mark(phase):
+        nonlocal started
+        timings[phase] = round(time.perf_counter() - started, 3)
+        started = time.perf_counter()
+    
+    with startup_lock():
+        mark("lock")
+        created = await run_in_threadpool(prepare_schema)
+        mark("create_all" if created else "schema_check")
+        await run_in_threadpool(init_admin)
+        mark("admin")
+        if crud.DASHBOARD_COUNTERS:
+            await run_in_threadpool(rebuild_dashboard_counters)
+            mark("counters")
+    
+    await run_in_threadpool(warm_caches)
+    mark("caches")
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    mark("db_pool")
+    from utils import WEASYPRINT_AVAILABLE
+    if WEASYPRINT_AVAILABLE:
+        await run_in_threadpool(pdf_renderer.start)
+        mark("pdf_pool")
+    
+    app.state.startup_timings = timings
+    for phase, seconds in timings.items():
+        metrics.STARTUP_SECONDS.labels(phase).set(seconds)
+    logger.info("Startup took %.2f s (%s)", sum(timings.values()),
+                ", ".join(f"{phase} {seconds:.2f} s" for phase, seconds in timings.items()))
+    yield
+    
+    pdf_renderer.shutdown()
+    shutdown_password_pool()
+    await async_engine.dispose()
+
+app = FastAPI(
+    title="Lab Management System",
+    docs_url=None,
+    redoc_url=None,
+    lifespan=lifespan
+)
+
+# Request, DB pool and PDF render metrics, served on /metrics, and per-request SQL stats
+app.add_middleware(metrics.MetricsMiddleware)
+app.add_middleware(metrics.QueryStatsMiddleware)
+metrics.instrument_engine(engine, "sync")
+metrics.instrument_engine(async_engine.sync_engine, "async")
+
+# Mount static files
+app.mount("/static", StaticFiles(directory="static"), name="static")
+
+# Templates
+templates = Jinja2Templates(directory="templates")
 
 def get_current_user(request: Request):
     token = request.cookies.get("access_token")
-    if not token or not (username := verify_token(token)):
+    if not token or not (username := token_cache.verify(token)):
         raise HTTPException(status_code=401, detail="Not authenticated")
     return username
 
 # Routes
+@app.get("/metrics")
+def metrics_endpoint(request: Request):
+    # Scrapers authenticate with METRICS_TOKEN; a logged-in user can look too
+    # Compared as bytes: compare_digest raises TypeError on non-ASCII str
+    authorization = request.headers.get("authorization", "").encode()
+    expected = f"Bearer {metrics.METRICS_TOKEN}".encode()
+    if not (metrics.METRICS_TOKEN and hmac.compare_digest(authorization, expected)):
+        get_current_user(request)
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+# Plain def: checking the token may query revoked_tokens, so it runs in the threadpool
 @app.get("/", response_class=HTMLResponse)
-async def root(request: Request):
+def root(request: Request):
     try:
         get_current_user(request)
         return RedirectResponse(url="/dashboard", status_code=302)
@@ -64,14 +188,34 @@ async def login_page(request: Request):
     return templates.TemplateResponse("login.html", {"request": request})
 
 @app.post("/login")
-async def login(request: Request, username: str = Form(...), password: str = Form(...), db: Session = Depends(get_db)):
-    admin = crud.get_admin_user(db, username)
-    if not admin or not verify_password(password, admin.hashed_password):
+async def login(request: Request, username: str = Form(...), password: str = Form(...), db: AsyncSession = Depends(get_async_db)):
+    # Refuse brute-force bursts before spending any time on bcrypt
+    client_ip = login_throttle.client_ip(
+        request.headers.get("x-forwarded-for"), request.client.host if request.client else None
+    )
+    retry_after = login_throttle.check(client_ip, username)
+    if retry_after is not None:
+        return templates.TemplateResponse("login.html", {
+            "request": request,
+            "error": "Too many login attempts, please try again later"
+        }, status_code=429, headers={"Retry-After": str(int(retry_after))})
+    
+    admin = await crud_async.get_admin_user(db, username)
+    try:
+        valid = admin is not None and await verify_password_async(password, admin.hashed_password)
+    except PasswordQueueFull:
+        return templates.TemplateResponse("login.html", {
+            "request": request,
+            "error": "The server is busy, please try again"
+        }, status_code=503, headers={"Retry-After": "2"})
+    if not valid:
+        login_throttle.failed(client_ip, username)
         return templates.TemplateResponse("login.html", {
             "request": request, 
             "error": "Invalid username or password"
         })
     
+    login_throttle.succeeded(client_ip, username)
     access_token = create_access_token(
         data={"sub": admin.username}, expires_delta=timedelta(hours=24)
     )
@@ -81,14 +225,17 @@ async def login(request: Request, username: str = Form(...), password: str = For
     return response
 
 @app.get("/logout")
-async def logout():
+def logout(request: Request):
+    token = request.cookies.get("access_token")
+    if token:
+        token_cache.revoke(token)
     response = RedirectResponse(url="/login", status_code=302)
     response.delete_cookie(key="access_token")
     return response
 
 @app.get("/dashboard", response_class=HTMLResponse)
-async def dashboard(request: Request, user: str = Depends(get_current_user), db: Session = Depends(get_db)):
-    stats = crud.get_dashboard_stats(db)
+async def dashboard(request: Request, user: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    stats = await crud_async.get_dashboard_stats(db)
     return templates.TemplateResponse("dashboard.html", {
         "request": request, 
         "user": user,
@@ -97,12 +244,21 @@ async def dashboard(request: Request, user: str = Depends(get_current_user), db:
 
 # Patient routes
 @app.get("/patients", response_class=HTMLResponse)
-async def patients_page(request: Request, search: Optional[str] = None, user: str = Depends(get_current_user), db: Session = Depends(get_db)):
-    patients = crud.get_patients(db, search=search)
+async def patients_page(
+    request: Request,
+    search: Optional[str] = None,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    user: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    page = await crud_async.get_patients_page(db, search=search, after=after, before=before)
     return templates.TemplateResponse("patients.html", {
         "request": request,
         "user": user,
-        "patients": patients,
+        "patients": page["items"],
+        "next_cursor": page["next_cursor"],
+        "prev_cursor": page["prev_cursor"],
         "search": search or ""
     })
 
@@ -113,15 +269,15 @@ async def create_patient_endpoint(
     gender: str = Form(...),
     phone: str = Form(...),
     user: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     patient_data = schemas.PatientCreate(name=name, age=age, gender=gender, phone=phone)
-    crud.create_patient(db, patient_data)
+    await crud_async.create_patient(db, patient_data)
     return RedirectResponse(url="/patients", status_code=302)
 
 @app.get("/patients/{patient_id}/edit", response_class=HTMLResponse)
-async def edit_patient_page(request: Request, patient_id: int, user: str = Depends(get_current_user), db: Session = Depends(get_db)):
-    patient = crud.get_patient(db, patient_id)
+async def edit_patient_page(request: Request, patient_id: int, user: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    patient = await crud_async.get_patient(db, patient_id)
     if not patient:
         raise HTTPException(status_code=404, detail="Patient not found")
     
@@ -139,15 +295,15 @@ async def update_patient_endpoint(
     gender: str = Form(...),
     phone: str = Form(...),
     user: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     patient_data = schemas.PatientUpdate(name=name, age=age, gender=gender, phone=phone)
-    crud.update_patient(db, patient_id, patient_data)
+    await crud_async.update_patient(db, patient_id, patient_data)
     return RedirectResponse(url="/patients", status_code=302)
 
 @app.post("/patients/{patient_id}/delete")
-async def delete_patient_endpoint(patient_id: int, user: str = Depends(get_current_user), db: Session = Depends(get_db)):
-    crud.delete_patient(db, patient_id)
+async def delete_patient_endpoint(patient_id: int, user: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    await crud_async.delete_patient(db, patient_id)
     return RedirectResponse(url="/patients", status_code=302)
 
 # Test routes
@@ -156,26 +312,30 @@ async def tests_page(
     request: Request, 
     category_id: Optional[int] = None,
     user: str = Depends(get_current_user), 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    categories = crud.get_test_categories(db)
-    tests = crud.get_tests(db, category_id)
+    catalog = await crud_async.get_catalog(db)
+    tests = catalog.tests_by_category.get(category_id, ()) if category_id else catalog.tests
     return templates.TemplateResponse("tests.html", {
         "request": request,
         "user": user,
-        "categories": categories,
+        "categories": catalog.categories,
         "tests": tests,
         "selected_category": category_id
     })
 
+@app.get("/tests/cache-stats")
+async def catalog_cache_stats(user: str = Depends(get_current_user)):
+    return catalog_cache.stats()
+
 @app.post("/test-categories")
 async def create_category_endpoint(
     name: str = Form(...),
     user: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     category_data = schemas.TestCategoryCreate(name=name)
-    crud.create_test_category(db, category_data)
+    await crud_async.create_test_category(db, category_data)
     return RedirectResponse(url="/tests", status_code=302)
 
 @app.post("/tests")
@@ -186,7 +346,7 @@ async def create_test_endpoint(
     reference_range: Optional[str] = Form(None),
     category_id: int = Form(...),
     user: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     test_data = schemas.TestCreate(
         name=name,
@@ -195,13 +355,12 @@ async def create_test_endpoint(
         reference_range=reference_range or None,
         category_id=category_id
     )
-    crud.create_test(db, test_data)
+    await crud_async.create_test(db, test_data)
     return RedirectResponse(url="/tests", status_code=302)
 
 @app.get("/tests/{test_id}/edit", response_class=HTMLResponse)
-async def edit_test_page(request: Request, test_id: int, user: str = Depends(get_current_user), db: Session = Depends(get_db)):
-    test = crud.get_test(db, test_id)
-    categories = crud.get_test_categories(db)
+async def edit_test_page(request: Request, test_id: int, user: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    test = await crud_async.get_test(db, test_id)
     if not test:
         raise HTTPException(status_code=404, detail="Test not found")
     
@@ -209,7 +368,7 @@ async def edit_test_page(request: Request, test_id: int, user: str = Depends(get
         "request": request,
         "user": user,
         "test": test,
-        "categories": categories
+        "categories": (await crud_async.get_catalog(db)).categories
     })
 
 @app.post("/tests/{test_id}/edit")
@@ -221,7 +380,7 @@ async def update_test_endpoint(
     reference_range: Optional[str] = Form(None),
     category_id: int = Form(...),
     user: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     test_data = schemas.TestUpdate(
         name=name,
@@ -230,33 +389,40 @@ async def update_test_endpoint(
         reference_range=reference_range or None,
         category_id=category_id
     )
-    crud.update_test(db, test_id, test_data)
+    await crud_async.update_test(db, test_id, test_data)
     return RedirectResponse(url="/tests", status_code=302)
 
 @app.post("/tests/{test_id}/delete")
-async def delete_test_endpoint(test_id: int, user: str = Depends(get_current_user), db: Session = Depends(get_db)):
-    crud.delete_test(db, test_id)
+async def delete_test_endpoint(test_id: int, user: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    await crud_async.delete_test(db, test_id)
     return RedirectResponse(url="/tests", status_code=302)
 
 # Order routes
 @app.get("/orders", response_class=HTMLResponse)
-async def orders_page(request: Request, user: str = Depends(get_current_user), db: Session = Depends(get_db)):
-    orders = crud.get_orders(db)
+async def orders_page(
+    request: Request,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    user: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    page = await crud_async.get_orders_page(db, after=after, before=before)
     return templates.TemplateResponse("orders.html", {
         "request": request,
         "user": user,
-        "orders": orders
+        "orders": page["items"],
+        "next_cursor": page["next_cursor"],
+        "prev_cursor": page["prev_cursor"]
     })
 
 @app.get("/orders/new", response_class=HTMLResponse)
-async def new_order_page(request: Request, user: str = Depends(get_current_user), db: Session = Depends(get_db)):
-    patients = crud.get_patients(db)
-    tests = crud.get_tests(db)
+async def new_order_page(request: Request, user: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    patients = await crud_async.get_patients(db)
     return templates.TemplateResponse("new_order.html", {
         "request": request,
         "user": user,
         "patients": patients,
-        "tests": tests
+        "tests": (await crud_async.get_catalog(db)).tests
     })
 
 @app.post("/orders")
@@ -265,7 +431,7 @@ async def create_order_endpoint(
     patient_id: int = Form(...),
     referred_by: Optional[str] = Form(None),
     user: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     form_data = await request.form()
     test_ids = [int(tid) for tid in form_data.getlist("test_ids")]
@@ -274,12 +440,37 @@ async def create_order_endpoint(
         return RedirectResponse(url="/orders/new", status_code=302)
     
     order_data = schemas.TestOrderCreate(patient_id=patient_id, test_ids=test_ids, referred_by=referred_by)
-    crud.create_order(db, order_data)
+    try:
+        await crud_async.create_order(db, order_data)
+    except crud.InvalidTestIds as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return RedirectResponse(url="/orders", status_code=302)
 
+# JSON intake for kiosks and partner clinics: a batch of orders, all or nothing
+BULK_ORDER_MAX = int(os.getenv("BULK_ORDER_MAX", "1000"))
+
+@app.post("/api/orders/bulk", response_model=schemas.BulkOrderResult, status_code=201)
+async def create_orders_bulk_endpoint(
+    batch: schemas.BulkOrderRequest,
+    user: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    if not batch.orders:
+        raise HTTPException(status_code=400, detail="No orders given")
+    if len(batch.orders) > BULK_ORDER_MAX:
+        raise HTTPException(status_code=413, detail=f"At most {BULK_ORDER_MAX} orders per request")
+    try:
+        order_ids, patient_ids = await crud_async.create_orders_bulk(db, batch.orders)
+    except crud.InvalidOrderBatch as e:
+        raise HTTPException(status_code=422, detail=e.errors)
+    except IntegrityError:
+        # The batch conflicted with another write and was rolled back
+        raise HTTPException(status_code=409, detail="Conflicting write, please retry the batch")
+    return schemas.BulkOrderResult(order_ids=order_ids, patient_ids=patient_ids)
+
 @app.get("/orders/{order_id}", response_class=HTMLResponse)
-async def order_detail_page(request: Request, order_id: int, user: str = Depends(get_current_user), db: Session = Depends(get_db)):
-    order = crud.get_order(db, order_id)
+async def order_detail_page(request: Request, order_id: int, user: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    order = await crud_async.get_order_graph(db, order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     
@@ -290,34 +481,101 @@ async def order_detail_page(request: Request, order_id: int, user: str = Depends
     })
 
 @app.post("/orders/{order_id}/complete")
-async def complete_order_endpoint(order_id: int, user: str = Depends(get_current_user), db: Session = Depends(get_db)):
-    crud.update_order_status(db, order_id, "completed")
+async def complete_order_endpoint(order_id: int, user: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    await crud_async.update_order_status(db, order_id, "completed")
     return RedirectResponse(url=f"/orders/{order_id}", status_code=302)
 
 @app.post("/orders/{order_id}/delete")
-async def delete_order_endpoint(order_id: int, user: str = Depends(get_current_user), db: Session = Depends(get_db)):
-    order = crud.get_order(db, order_id)
+async def delete_order_endpoint(order_id: int, user: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    order = await crud_async.get_order(db, order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     if order.status != "pending":
         raise HTTPException(status_code=400, detail="Can only delete pending orders")
     
-    crud.delete_order(db, order_id)
+    await crud_async.delete_order(db, order_id)
     return RedirectResponse(url="/orders", status_code=302)
 
 # Reports routes
 @app.get("/reports", response_class=HTMLResponse)
-async def reports_page(request: Request, user: str = Depends(get_current_user), db: Session = Depends(get_db)):
-    completed_orders = crud.get_orders(db, status="completed")
+async def reports_page(
+    request: Request,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    user: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    page = await crud_async.get_orders_page(db, status="completed", after=after, before=before, with_items=True)
     return templates.TemplateResponse("reports.html", {
         "request": request,
         "user": user,
-        "orders": completed_orders
+        "orders": page["items"],
+        "next_cursor": page["next_cursor"],
+        "prev_cursor": page["prev_cursor"]
     })
 
+# Upper bound on reports per print run, to keep one PDF render within reason
+BATCH_MAX_REPORTS = int(os.getenv("BATCH_MAX_REPORTS", "500"))
+
+# Declared before /reports/{order_id} so "batch" isn't parsed as an order id
+@app.get("/reports/batch/pdf")
+async def download_report_batch_pdf(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    order_ids: Optional[str] = None,
+    user: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        ids = [int(i) for i in order_ids.split(",") if i.strip()] if order_ids else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="order_ids must be a comma-separated list of numbers")
+    # date_from/date_to are completion days, so a shift prints what it finished
+    if not ids and not date_from and not date_to:
+        raise HTTPException(status_code=400, detail="Give a date range or a list of order ids")
+    
+    orders = await crud_async.get_order_graphs(
+        db,
+        order_ids=ids,
+        date_from=datetime.combine(date_from, datetime.min.time()) if date_from else None,
+        date_to=datetime.combine(date_to + timedelta(days=1), datetime.min.time()) if date_to else None,
+        limit=BATCH_MAX_REPORTS + 1
+    )
+    if not orders:
+        raise HTTPException(status_code=404, detail="No completed orders found")
+    if len(orders) > BATCH_MAX_REPORTS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_REPORTS} reports per print run")
+    
+    from utils import WEASYPRINT_AVAILABLE, render_report_batch
+    # Up to BATCH_MAX_REPORTS templates, so rendered in the threadpool
+    html_content = await run_in_threadpool(render_report_batch, orders)
+    filename = f"reports_{orders[0].id}-{orders[-1].id}"
+    if WEASYPRINT_AVAILABLE:
+        try:
+            pdf_bytes = await pdf_renderer.render_pdf(html_content)
+        except pdf_renderer.RenderQueueFull:
+            raise HTTPException(
+                status_code=503,
+                detail="Report renderer is busy, please try again",
+                headers={"Retry-After": "5"}
+            )
+        # None means WeasyPrint failed, so fall back to HTML like single reports do
+        if pdf_bytes:
+            return Response(
+                content=pdf_bytes,
+                media_type="application/pdf",
+                headers={"Content-Disposition": f"attachment; filename={filename}.pdf"}
+            )
+    
+    return Response(
+        content=html_content.encode('utf-8'),
+        media_type="text/html",
+        headers={"Content-Disposition": f"inline; filename={filename}.html"}
+    )
+
 @app.get("/reports/{order_id}", response_class=HTMLResponse)
-async def report_detail_page(request: Request, order_id: int, user: str = Depends(get_current_user), db: Session = Depends(get_db)):
-    order = crud.get_order(db, order_id)
+async def report_detail_page(request: Request, order_id: int, user: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    order = await crud_async.get_order_graph(db, order_id, include_category=False)
     if not order or order.status != "completed":
         raise HTTPException(status_code=404, detail="Completed order not found")
     
@@ -328,8 +586,8 @@ async def report_detail_page(request: Request, order_id: int, user: str = Depend
     })
 
 @app.get("/reports/{order_id}/edit", response_class=HTMLResponse)
-async def edit_report_page(request: Request, order_id: int, user: str = Depends(get_current_user), db: Session = Depends(get_db)):
-    order = crud.get_order(db, order_id)
+async def edit_report_page(request: Request, order_id: int, user: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    order = await crud_async.get_order_graph(db, order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     
@@ -344,24 +602,25 @@ async def update_all_report_items_endpoint(
     request: Request,
     order_id: int,
     user: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     form_data = await request.form()
-    order = crud.get_order(db, order_id)
+    order = await crud_async.get_order(db, order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     
-    # Update each item
-    for item in order.items:
-        result_value = form_data.get(f"result_value_{item.id}")
-        result_notes = form_data.get(f"result_notes_{item.id}")
-        
-        if result_value is not None:
-            item_data = schemas.TestOrderItemUpdate(
-                result_value=result_value if result_value.strip() else None,
-                result_notes=result_notes if result_notes and result_notes.strip() else None
-            )
-            crud.update_order_item_result(db, item.id, item_data)
+    # Collect every submitted item and write the changed ones in a single batch
+    results = {}
+    for key, result_value in form_data.items():
+        if not key.startswith("result_value_") or not key[len("result_value_"):].isdigit():
+            continue
+        item_id = int(key[len("result_value_"):])
+        result_notes = form_data.get(f"result_notes_{item_id}")
+        results[item_id] = schemas.TestOrderItemUpdate(
+            result_value=result_value if result_value.strip() else None,
+            result_notes=result_notes if result_notes and result_notes.strip() else None
+        )
+    await crud_async.update_order_results(db, order_id, results)
     
     return RedirectResponse(url=f"/reports/{order_id}", status_code=302)
 
@@ -371,34 +630,44 @@ async def update_report_item_endpoint(
     result_value: str = Form(...),
     result_notes: Optional[str] = Form(None),
     user: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     item_data = schemas.TestOrderItemUpdate(
         result_value=result_value,
         result_notes=result_notes or None
     )
-    item = crud.update_order_item_result(db, item_id, item_data)
+    item = await crud_async.update_order_item_result(db, item_id, item_data)
     if not item:
         raise HTTPException(status_code=404, detail="Order item not found")
     
     return RedirectResponse(url=f"/reports/{item.order_id}/edit", status_code=302)
 
 @app.get("/reports/{order_id}/pdf")
-async def download_report_pdf(order_id: int, user: str = Depends(get_current_user), db: Session = Depends(get_db)):
-    order = crud.get_order(db, order_id)
+async def download_report_pdf(order_id: int, user: str = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    order = await crud_async.get_order_graph(db, order_id, include_category=False)
     if not order or order.status != "completed":
         raise HTTPException(status_code=404, detail="Completed order not found")
     
     try:
-        from utils import WEASYPRINT_AVAILABLE, generate_report_pdf, generate_report_html
+        from utils import WEASYPRINT_AVAILABLE, REPORT_TEMPLATE_VERSION, render_report, generate_report_html
         
         if WEASYPRINT_AVAILABLE:
-            pdf_bytes = generate_report_pdf(order)
-            return Response(
-                content=pdf_bytes,
-                media_type="application/pdf",
-                headers={"Content-Disposition": f"attachment; filename=report_{order_id}.pdf"}
-            )
+            pdf_headers = {"Content-Disposition": f"attachment; filename=report_{order_id}.pdf"}
+            cache_key = pdf_cache.report_key(order, REPORT_TEMPLATE_VERSION)
+            cached_path = pdf_cache.get(order_id, cache_key)
+            if cached_path:
+                return FileResponse(cached_path, media_type="application/pdf", headers=pdf_headers)
+            
+            # Rendered in the PDF process pool; None means WeasyPrint failed, so fall back to HTML
+            pdf_bytes = await pdf_renderer.render_pdf(render_report(order))
+            if pdf_bytes:
+                # Writes the file and may sweep the cache directory, so off the event loop
+                await run_in_threadpool(pdf_cache.put, order_id, cache_key, pdf_bytes)
+                return Response(
+                    content=pdf_bytes,
+                    media_type="application/pdf",
+                    headers=pdf_headers
+                )
         
         html_content = generate_report_html(order)
         return Response(
@@ -406,9 +675,49 @@ async def download_report_pdf(order_id: int, user: str = Depends(get_current_use
             media_type="text/html",
             headers={"Content-Disposition": f"inline; filename=report_{order_id}.html"}
         )
+    except pdf_renderer.RenderQueueFull:
+        raise HTTPException(
+            status_code=503,
+            detail="Report renderer is busy, please try again",
+            headers={"Retry-After": "5"}
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating report: {str(e)}")
 
+@app.get("/exports/results.{fmt}")
+def export_results(
+    fmt: str,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    category_id: Optional[int] = None,
+    status: Optional[str] = None,
+    user: str = Depends(get_current_user)
+):
+    if fmt not in exports.FORMATS:
+        raise HTTPException(status_code=404, detail="Unknown export format")
+    formatter, media_type = exports.FORMATS[fmt]
+    
+    # Streamed from a server-side cursor on its own sync session; Starlette iterates
+    # the generator in a worker thread, so the event loop never waits on the query
+    def generate():
+        db = SessionLocal()
+        try:
+            yield from formatter(crud.iter_order_results(
+                db,
+                date_from=datetime.combine(date_from, datetime.min.time()) if date_from else None,
+                date_to=datetime.combine(date_to + timedelta(days=1), datetime.min.time()) if date_to else None,
+                category_id=category_id,
+                status=status
+            ))
+        finally:
+            db.close()
+    
+    return StreamingResponse(
+        generate(),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=results.{fmt}"}
+    )
+
 if __name__ == "__main__":
     import uvicorn
     
@@ -0,0 +1,189 @@
+import json
+import logging
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+)
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+from starlette.routing import Match
+
+import database
+
+# Prometheus metrics for the app.
+# Under gunicorn every worker is a separate process, so when PROMETHEUS_MULTIPROC_DIR
+# is set each worker writes its samples to files in that directory and /metrics sums
+# them over all workers. gunicorn.conf.py sets it, empties the directory when gunicorn
+# starts and tidies up after workers that exit.
+#
+# METRICS_TOKEN     bearer token a scraper can send instead of logging in
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+REQUESTS = Counter(
+    "lms_http_requests_total", "HTTP requests handled", ["method", "route", "status"]
+)
+REQUEST_SECONDS = Histogram(
+    "lms_http_request_duration_seconds", "Time to handle an HTTP request", ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+IN_PROGRESS = Gauge(
+    "lms_http_requests_in_progress", "HTTP requests being handled", ["method", "route"],
+    multiprocess_mode="livesum"
+)
+DB_CHECKOUT_SECONDS = Histogram(
+    "lms_db_pool_checkout_seconds", "Time to get a connection from the pool", ["engine"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5, 30)
+)
+DB_CHECKOUT_TIMEOUTS = Counter(
+    "lms_db_pool_timeouts_total", "Checkouts that gave up after DB_POOL_TIMEOUT", ["engine"]
+)
+DB_CHECKED_OUT = Gauge(
+    "lms_db_pool_checked_out", "Connections currently checked out", ["engine"], multiprocess_mode="livesum"
+)
+DB_CAPACITY = Gauge(
+    "lms_db_pool_capacity", "Connections the pool may hand out (size + overflow)", ["engine"],
+    multiprocess_mode="livesum"
+)
+DB_CONNECTIONS = Counter(
+    "lms_db_connections_total", "Connections opened, closed and invalidated", ["engine", "event"]
+)
+STARTUP_SECONDS = Gauge(
+    "lms_startup_seconds", "Time spent in each startup phase of a worker", ["phase"], multiprocess_mode="max"
+)
+PDF_RENDER_SECONDS = Histogram(
+    "lms_pdf_render_seconds", "Time to convert report HTML to PDF", ["mode"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+)
+
+def route_template(app, scope) -> str:
+    """The path template of the route a request will be handled by, e.g. /orders/{order_id}"""
+    for route in app.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return "unmatched"
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = route_template(scope["app"], scope)
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_progress = IN_PROGRESS.labels(method, route)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUEST_SECONDS.labels(method, route).observe(time.perf_counter() - started)
+            REQUESTS.labels(method, route, str(status)).inc()
+            in_progress.dec()
+
+# uvicorn and gunicorn only configure their own loggers, so lms.sql gets its own
+# stderr handler; without it the default "log" mode would print nothing
+sql_logger = logging.getLogger("lms.sql")
+if not sql_logger.handlers:
+    _sql_handler = logging.StreamHandler()
+    _sql_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+    sql_logger.addHandler(_sql_handler)
+    sql_logger.setLevel(logging.INFO)
+    sql_logger.propagate = False
+
+class QueryStatsMiddleware:
+    """Per-request statement count, DB time and N+1 patterns (see database.SQL_STATS)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or (database.SQL_STATS == "off" and not database.SQL_STATS_STRICT):
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        with database.collect_queries() as stats:
+            async def send_wrapper(message):
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    # Templates have rendered by now, so their lazy loads are counted
+                    if database.SQL_STATS_STRICT and stats.n_plus_one():
+                        raise database.NPlusOneQuery(
+                            f"{scope['method']} {scope['path']}: "
+                            + "; ".join(f"{p['count']}x {p['statement']}" for p in stats.n_plus_one())
+                        )
+                    if database.SQL_STATS == "header":
+                        value = f"queries={stats.count}; db_ms={stats.seconds * 1000:.1f}; n_plus_one={len(stats.n_plus_one())}"
+                        message["headers"] = list(message.get("headers", [])) + [(b"x-sql-stats", value.encode())]
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+
+        n_plus_one = stats.n_plus_one()
+        if database.SQL_STATS == "log" or n_plus_one:
+            sql_logger.log(logging.WARNING if n_plus_one else logging.INFO, json.dumps({
+                "method": scope["method"],
+                "route": route_template(scope["app"], scope),
+                "path": scope["path"],
+                "status": status,
+                "queries": stats.count,
+                "db_ms": round(stats.seconds * 1000, 2),
+                "n_plus_one": n_plus_one,
+            }))
+
+def instrument_engine(engine, name: str):
+    """Record checkout wait, saturation and connection churn for the engine's pool"""
+    histogram = DB_CHECKOUT_SECONDS.labels(name)
+    timeouts = DB_CHECKOUT_TIMEOUTS.labels(name)
+    checked_out = DB_CHECKED_OUT.labels(name)
+
+    def wrap(pool):
+        connect = pool.connect
+
+        def timed_connect():
+            started = time.perf_counter()
+            try:
+                return connect()
+            except exc.TimeoutError:
+                timeouts.inc()
+                raise
+            finally:
+                histogram.observe(time.perf_counter() - started)
+
+        pool.connect = timed_connect
+        # Saturation is lms_db_pool_checked_out / lms_db_pool_capacity
+        if isinstance(pool, QueuePool):
+            DB_CAPACITY.labels(name).set(pool.size() + max(pool._max_overflow, 0))
+
+    wrap(engine.pool)
+    # dispose() replaces the pool, so wrap the new one too (pool events carry over)
+    event.listen(engine, "engine_disposed", lambda e: wrap(e.pool))
+
+    event.listen(engine, "checkout", lambda *args: checked_out.inc())
+    event.listen(engine, "checkin", lambda *args: checked_out.dec())
+    for pool_event, label in (("connect", "opened"), ("close", "closed"), ("invalidate", "invalidated")):
+        counter = DB_CONNECTIONS.labels(name, label)
+        event.listen(engine, pool_event, lambda *args, counter=counter: counter.inc())
+
+def render() -> bytes:
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
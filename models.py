@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Float, Text, ForeignKey, Boolean
+from sqlalchemy import create_engine, Column, Integer, String, DateTime, Float, Text, ForeignKey, Boolean, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
 from datetime import datetime
@@ -20,11 +20,16 @@ class Patient(Base):
     name = Column(String(100), nullable=False)
     age = Column(Integer, nullable=False)
     gender = Column(String(10), nullable=False)
-    phone = Column(String(20), nullable=False)
+    phone = Column(String(20), nullable=False, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
     orders = relationship("TestOrder", back_populates="patient")
+    
+    __table_args__ = (
+        # Keyset pagination on the patients list
+        Index("ix_patients_created_at_id", "created_at", "id"),
+    )
 
 class TestCategory(Base):
     __tablename__ = "test_categories"
@@ -48,30 +53,66 @@ class Test(Base):
     # Relationships
     category = relationship("TestCategory", back_populates="tests")
     order_items = relationship("TestOrderItem", back_populates="test")
+    
+    __table_args__ = (
+        Index("ix_tests_category_id_name", "category_id", "name"),
+    )
 
 class TestOrder(Base):
     __tablename__ = "test_orders"
     
     id = Column(Integer, primary_key=True, index=True)
-    patient_id = Column(Integer, ForeignKey("patients.id"), nullable=False)
+    patient_id = Column(Integer, ForeignKey("patients.id"), nullable=False, index=True)
     ordered_at = Column(DateTime, default=datetime.utcnow)
     total_amount = Column(Float, nullable=False, default=0.0)
     status = Column(String(20), nullable=False, default="pending")  # pending/completed
+    completed_at = Column(DateTime, nullable=True)  # set while status is completed
     referred_by = Column(String(150), nullable=True)
     
     # Relationships
     patient = relationship("Patient", back_populates="orders")
     items = relationship("TestOrderItem", back_populates="order", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        # Keyset pagination: newest-first over all orders, and per status for the
+        # pending worklist and the reports page. (Not partial indexes: SQLite can't
+        # match a partial index against a bound status parameter.)
+        Index("ix_test_orders_ordered_at_id", "ordered_at", "id"),
+        Index("ix_test_orders_status_ordered_at_id", "status", "ordered_at", "id"),
+        # Print runs select the reports completed in a date range
+        Index("ix_test_orders_completed_at_id", "completed_at", "id"),
+    )
 
 class TestOrderItem(Base):
     __tablename__ = "test_order_items"
     
     id = Column(Integer, primary_key=True, index=True)
-    order_id = Column(Integer, ForeignKey("test_orders.id"), nullable=False)
-    test_id = Column(Integer, ForeignKey("tests.id"), nullable=False)
+    order_id = Column(Integer, ForeignKey("test_orders.id"), nullable=False, index=True)
+    test_id = Column(Integer, ForeignKey("tests.id"), nullable=False, index=True)
     result_value = Column(String(100), nullable=True)
     result_notes = Column(Text, nullable=True)
     
     # Relationships
     order = relationship("TestOrder", back_populates="items")
-    test = relationship("Test", back_populates="order_items")
\ No newline at end of file
+    test = relationship("Test", back_populates="order_items")
+
+class DashboardCounter(Base):
+    __tablename__ = "dashboard_counters"
+    
+    name = Column(String(50), primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+    
+    id = Column(Integer, primary_key=True)
+    token_digest = Column(String(64), nullable=False, unique=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+class SeedState(Base):
+    __tablename__ = "seed_state"
+    
+    # Content hash of the data a seeder last applied, e.g. the test catalog files
+    name = Column(String(50), primary_key=True)
+    content_hash = Column(String(64), nullable=False)
+    applied_at = Column(DateTime, nullable=False, default=datetime.utcnow)
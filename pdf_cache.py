@@ -0,0 +1,82 @@
+import hashlib
+import json
+import os
+import tempfile
+from typing import Optional
+
+# On-disk cache of rendered report PDFs.
+# Files are named by a hash of everything that ends up in the report, so a changed
+# result produces a new key and the old PDF is never served again. Recency is the
+# file mtime (touched on every hit) and the directory is trimmed back under
+# PDF_CACHE_MAX_MB, oldest first, whenever a new PDF is stored. The directory can be
+# shared by all gunicorn workers.
+PDF_CACHE_DIR = os.getenv("PDF_CACHE_DIR", "./pdf_cache")
+PDF_CACHE_MAX_BYTES = int(float(os.getenv("PDF_CACHE_MAX_MB", "256")) * 1024 * 1024)
+
+def report_key(order, template_version: str) -> str:
+    """Hash of the patient, order, items and template version that make up a report"""
+    patient = order.patient
+    payload = {
+        "template": template_version,
+        "order": [order.id, order.ordered_at.isoformat() if order.ordered_at else None,
+                  order.referred_by, order.status],
+        "patient": [patient.id, patient.name, patient.age, patient.gender, patient.phone],
+        "items": [
+            [item.id, item.test.name, item.test.unit, item.test.reference_range,
+             item.result_value, item.result_notes]
+            for item in sorted(order.items, key=lambda i: i.id)
+        ],
+    }
+    encoded = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+def _path(order_id: int, key: str) -> str:
+    return os.path.join(PDF_CACHE_DIR, f"report_{order_id}_{key}.pdf")
+
+def get(order_id: int, key: str) -> Optional[str]:
+    """Path of the cached PDF for this key, or None on a miss"""
+    path = _path(order_id, key)
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        return None
+    return path
+
+def put(order_id: int, key: str, pdf_bytes: bytes) -> str:
+    os.makedirs(PDF_CACHE_DIR, exist_ok=True)
+    # Older renders of the same order can never be hit again
+    prefix = f"report_{order_id}_"
+    for name in os.listdir(PDF_CACHE_DIR):
+        if name.startswith(prefix) and name != os.path.basename(_path(order_id, key)):
+            _remove(os.path.join(PDF_CACHE_DIR, name))
+
+    # Write to a temp file and rename so readers never see a partial PDF
+    fd, tmp_path = tempfile.mkstemp(dir=PDF_CACHE_DIR, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(pdf_bytes)
+    path = _path(order_id, key)
+    os.replace(tmp_path, path)
+    _evict()
+    return path
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def _evict():
+    entries = []
+    total = 0
+    for entry in os.scandir(PDF_CACHE_DIR):
+        if entry.is_file() and entry.name.endswith(".pdf"):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+    if total <= PDF_CACHE_MAX_BYTES:
+        return
+    for _, size, path in sorted(entries):
+        _remove(path)
+        total -= size
+        if total <= PDF_CACHE_MAX_BYTES:
+            break
@@ -0,0 +1,110 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+import metrics
+
+# PDF rendering off the event loop.
+# WeasyPrint is CPU-bound and holds the GIL, so a thread pool would still stall the
+# worker; instead reports are converted in a pool of separate processes that import
+# WeasyPrint and load fonts once when they start. The template itself is rendered in
+# the web process (it's cheap) and only the HTML string crosses the process boundary.
+#
+# PDF_WORKERS       processes in the pool (0 renders inline on the event loop)
+# PDF_QUEUE_SIZE    renders allowed to wait for a free process before new ones are refused
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", "2"))
+PDF_QUEUE_SIZE = int(os.getenv("PDF_QUEUE_SIZE", "16"))
+
+class RenderQueueFull(Exception):
+    """Raised when PDF_WORKERS + PDF_QUEUE_SIZE renders are already in flight"""
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_in_flight = 0
+
+def _init_worker():
+    # Runs once in each pool process: import WeasyPrint, build the font configuration
+    # and lay out a tiny document so fontconfig's caches are hot before real work
+    import utils
+    if utils.WEASYPRINT_AVAILABLE:
+        utils.html_to_pdf("<p>warm up</p>")
+
+def _render(html_content: str) -> Optional[bytes]:
+    import utils
+    try:
+        return utils.html_to_pdf(html_content)
+    except Exception:
+        return None
+
+def _ping() -> int:
+    return os.getpid()
+
+def get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn rather than fork: the web process has DB connections and threads
+            _pool = ProcessPoolExecutor(
+                max_workers=PDF_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker
+            )
+        return _pool
+
+def start():
+    """Start every pool process now so the first downloads don't pay for startup"""
+    if PDF_WORKERS <= 0:
+        return
+    pool = get_pool()
+    futures = [pool.submit(_ping) for _ in range(PDF_WORKERS)]
+    for future in futures:
+        future.result()
+
+def _discard_pool(pool: ProcessPoolExecutor):
+    # A pool whose process died (OOM kill, segfault in a native library) refuses all
+    # further work; drop it so the next get_pool() starts a fresh one
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def shutdown():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+async def render_pdf(html_content: str) -> Optional[bytes]:
+    """Convert report HTML to PDF without blocking the event loop; None if rendering failed"""
+    global _in_flight
+    started = time.perf_counter()
+    if PDF_WORKERS <= 0:
+        try:
+            return _render(html_content)
+        finally:
+            metrics.PDF_RENDER_SECONDS.labels("inline").observe(time.perf_counter() - started)
+    if _in_flight >= PDF_WORKERS + PDF_QUEUE_SIZE:
+        raise RenderQueueFull()
+    _in_flight += 1
+    try:
+        loop = asyncio.get_running_loop()
+        # Retried once on a fresh pool if a process died; None after that so callers
+        # fall back to HTML instead of failing every download until a restart
+        for _ in range(2):
+            pool = get_pool()
+            try:
+                return await loop.run_in_executor(pool, _render, html_content)
+            except BrokenProcessPool:
+                _discard_pool(pool)
+        return None
+    finally:
+        _in_flight -= 1
+        # Includes any wait for a free process, which is what a download sees
+        metrics.PDF_RENDER_SECONDS.labels("pool").observe(time.perf_counter() - started)
@@ -83,6 +83,18 @@ class TestOrderBase(BaseModel):
 class TestOrderCreate(TestOrderBase):
     test_ids: List[int]
 
+# Bulk order intake: each order names an existing patient or carries a new one
+class BulkOrder(TestOrderCreate):
+    patient_id: Optional[int] = None
+    patient: Optional[PatientCreate] = None
+
+class BulkOrderRequest(BaseModel):
+    orders: List[BulkOrder]
+
+class BulkOrderResult(BaseModel):
+    order_ids: List[int]
+    patient_ids: List[int]
+
 class TestOrderUpdate(BaseModel):
     status: Optional[str] = None
 
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Concurrency benchmark: sync sessions inside async handlers vs the async session path.
+
+Fires N simultaneous "slow report" queries from coroutines on one event loop, the
+way N concurrent requests hit a single uvicorn worker, and reports total wall time,
+throughput and how late a 10 ms heartbeat task ran while they were in flight.
+
+    python scripts/bench_async_db.py --concurrency 20
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from database import SessionLocal, AsyncSessionLocal, engine
+
+def slow_query_sql():
+    if engine.dialect.name == "postgresql":
+        return "SELECT pg_sleep(0.2)"
+    # ~0.2s of CPU inside SQLite
+    return ("WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 1000000) "
+            "SELECT count(*) FROM c")
+
+async def slow_request_sync(sql):
+    # What the routes did before: a blocking session call inside `async def`
+    db = SessionLocal()
+    try:
+        db.execute(text(sql)).scalar()
+    finally:
+        db.close()
+
+async def slow_request_async(sql):
+    async with AsyncSessionLocal() as db:
+        (await db.execute(text(sql))).scalar()
+
+async def heartbeat(stop, lags):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.01)
+        lags.append(time.perf_counter() - started - 0.01)
+
+async def run(mode, concurrency, sql):
+    request = slow_request_sync if mode == "sync" else slow_request_async
+    stop, lags = asyncio.Event(), []
+    beat = asyncio.create_task(heartbeat(stop, lags))
+    started = time.perf_counter()
+    await asyncio.gather(*(request(sql) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await beat
+    lags.sort()
+    return {
+        "mode": mode,
+        "requests": concurrency,
+        "wall_s": round(elapsed, 3),
+        "req_per_s": round(concurrency / elapsed, 2),
+        "heartbeats": len(lags),
+        "max_loop_lag_ms": round(lags[-1] * 1000, 1) if lags else None,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    sql = slow_query_sql()
+    print(f"Backend: {engine.dialect.name}, {args.concurrency} simultaneous slow requests")
+    for mode in ("sync", "async"):
+        result = asyncio.run(run(mode, args.concurrency, sql))
+        print("  ".join(f"{k}={v}" for k, v in result.items()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Cost of authenticating a request, with and without the verified-token cache.
+
+Times auth.verify_token (full JWT signature check) against token_cache.verify on a
+cached token, then an authenticated patient search through the app both
+ways, and checks that a token stops working as soon as it is revoked. Uses a
+throwaway SQLite database unless DATABASE_URL is set.
+
+    python scripts/bench_auth.py --calls 20000 --requests 500
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='bench_auth_'), 'lms.db')}"
+os.environ.setdefault("SQL_STATS", "off")
+
+import httpx
+
+import auth
+import main
+import token_cache
+
+def per_call_us(func, token, calls):
+    started = time.perf_counter()
+    for _ in range(calls):
+        func(token)
+    return (time.perf_counter() - started) / calls * 1e6
+
+async def route_ms(client, token, count):
+    latencies = []
+    for _ in range(count):
+        started = time.perf_counter()
+        response = await client.get("/patients", params={"search": "a"}, cookies={"access_token": token})
+        latencies.append((time.perf_counter() - started) * 1000)
+        response.raise_for_status()
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(len(latencies) * 0.99) - 1]
+
+async def run(args):
+    async with main.app.router.lifespan_context(main.app):
+        token = auth.create_access_token({"sub": "admin"})
+        uncached = per_call_us(auth.verify_token, token, args.calls)
+        token_cache.verify(token)
+        cached = per_call_us(token_cache.verify, token, args.calls)
+        print(f"dependency: verify_token {uncached:.1f} us/call, cached {cached:.2f} us/call "
+              f"({uncached / cached:.0f}x)")
+
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            # A zero TTL makes every request verify the signature again
+            ttl, token_cache.TOKEN_CACHE_TTL = token_cache.TOKEN_CACHE_TTL, 0
+            token_cache._tokens.clear()
+            without = await route_ms(client, token, args.requests)
+            token_cache.TOKEN_CACHE_TTL = ttl
+            token_cache.verify(token)
+            cached_route = await route_ms(client, token, args.requests)
+            print(f"/patients search: uncached p50={without[0]:.2f}ms p99={without[1]:.2f}ms, "
+                  f"cached p50={cached_route[0]:.2f}ms p99={cached_route[1]:.2f}ms")
+
+            await client.get("/logout", cookies={"access_token": token})
+            response = await client.get("/patients", cookies={"access_token": token})
+            if response.status_code != 401:
+                sys.exit(f"FAIL revoked token still accepted ({response.status_code})")
+            print("revocation: logged-out token rejected")
+    print(token_cache.stats())
+
+def main_():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20000, help="calls per dependency timing")
+    parser.add_argument("--requests", type=int, default=500, help="requests per route timing")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main_()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Statements and time per crud.create_order call for small, typical and large orders.
+
+Seeds the test catalog into a throwaway SQLite database (unless DATABASE_URL is set)
+and creates --orders orders of each size in --sizes, timing each call and counting
+the SQL statements it sends (an executemany counts once). Also checks that orders
+listing a test twice or an unknown test id are refused.
+
+    python scripts/bench_create_order.py --sizes 1,20,80 --orders 200
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='bench_order_'), 'lms.db')}"
+
+import catalog_seed
+import crud
+import schemas
+from database import SessionLocal, collect_queries, create_tables
+from models import Patient, Test
+
+def run_size(test_ids, patient_id, orders):
+    statements, latencies = [], []
+    for _ in range(orders):
+        db = SessionLocal()
+        try:
+            with collect_queries() as stats:
+                started = time.perf_counter()
+                crud.create_order(db, schemas.TestOrderCreate(patient_id=patient_id, test_ids=test_ids))
+                latencies.append((time.perf_counter() - started) * 1000)
+        finally:
+            db.close()
+        statements.append(stats.count)
+    return statements, latencies
+
+def refused(test_ids, patient_id):
+    db = SessionLocal()
+    try:
+        crud.create_order(db, schemas.TestOrderCreate(patient_id=patient_id, test_ids=test_ids))
+    except crud.InvalidTestIds as e:
+        return str(e)
+    finally:
+        db.close()
+    return None
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1,20,80", help="comma-separated tests per order")
+    parser.add_argument("--orders", type=int, default=200, help="orders per size")
+    args = parser.parse_args()
+
+    create_tables()
+    catalog_seed.seed_catalog_files()
+    db = SessionLocal()
+    try:
+        patient = Patient(name="Benchmark Patient", age=40, gender="Female", phone="0300-0000000")
+        db.add(patient)
+        db.commit()
+        patient_id = patient.id
+        catalog = [test_id for (test_id,) in db.query(Test.id).order_by(Test.id)]
+    finally:
+        db.close()
+
+    for size in (int(s) for s in args.sizes.split(",")):
+        if size > len(catalog):
+            sys.exit(f"Only {len(catalog)} tests in the catalog, can't make a {size}-test order")
+        statements, latencies = run_size(catalog[:size], patient_id, args.orders)
+        print(f"{size:>3} tests: {statistics.mean(statements):5.1f} statements/order "
+              f"(max {max(statements)}), p50={statistics.median(latencies):.2f}ms "
+              f"p99={sorted(latencies)[int(len(latencies) * 0.99) - 1]:.2f}ms")
+
+    duplicate = refused([catalog[0], catalog[0]], patient_id)
+    unknown = refused([catalog[0], max(catalog) + 1000], patient_id)
+    print(f"duplicate test id: {duplicate or 'ACCEPTED'}")
+    print(f"unknown test id: {unknown or 'ACCEPTED'}")
+    if not (duplicate and unknown):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Latency of other routes during a burst of logins, and brute-force throttling.
+
+Drives the app in-process: keeps --logins logins in flight (each one a bcrypt
+check) and meanwhile requests /dashboard --requests times, then prints p50/p95/p99
+dashboard latency with bcrypt run inline on the event loop (PASSWORD_WORKERS=0) and
+on the thread pool. Then fires --attempts wrong-password logins for one username and
+reports how many were refused by login_throttle and how many bcrypt checks ran.
+Uses a throwaway SQLite database unless DATABASE_URL is set.
+
+    python scripts/bench_login_storm.py --logins 12 --requests 20
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='bench_login_'), 'lms.db')}"
+os.environ.setdefault("SQL_STATS", "off")
+
+import httpx
+
+import auth
+import login_throttle
+import main
+
+USERNAME = os.getenv("ADMIN_USERNAME", "admin")
+PASSWORD = os.getenv("ADMIN_PASSWORD", "admin123")
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+async def storm(client, workers, logins, requests):
+    auth.PASSWORD_WORKERS = workers
+    auth.shutdown_password_pool()
+    # Every login in the storm comes from the same address; only brute_force is throttled
+    login_throttle.LOGIN_IP_ATTEMPTS = sys.maxsize
+    login_throttle.reset()
+
+    done = asyncio.Event()
+    completed = 0
+
+    async def login_loop():
+        nonlocal completed
+        while not done.is_set():
+            response = await client.post("/login", data={"username": USERNAME, "password": PASSWORD},
+                                         cookies={})
+            if response.status_code != 302:
+                sys.exit(f"FAIL login returned {response.status_code}")
+            completed += 1
+
+    tasks = [asyncio.create_task(login_loop()) for _ in range(logins)]
+    await asyncio.sleep(0.2)
+
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        (await client.get("/dashboard")).raise_for_status()
+        latencies.append((time.perf_counter() - started) * 1000)
+    done.set()
+    await asyncio.gather(*tasks)
+
+    mode = "inline" if workers == 0 else f"pool({workers})"
+    print(f"{mode:>10}: dashboard p50={percentile(latencies, 50):.1f}ms "
+          f"p95={percentile(latencies, 95):.1f}ms p99={percentile(latencies, 99):.1f}ms "
+          f"while {completed} logins completed")
+
+async def brute_force(client, attempts):
+    login_throttle.LOGIN_IP_ATTEMPTS = int(os.getenv("LOGIN_IP_ATTEMPTS", "30"))
+    login_throttle.reset()
+    checks = 0
+    verify_password = auth.verify_password
+
+    def counted(*args):
+        nonlocal checks
+        checks += 1
+        return verify_password(*args)
+
+    auth.verify_password = counted
+    statuses = {}
+    started = time.perf_counter()
+    try:
+        for _ in range(attempts):
+            response = await client.post("/login", data={"username": USERNAME, "password": "wrong"}, cookies={})
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+    finally:
+        auth.verify_password = verify_password
+    print(f"brute force: {attempts} wrong passwords in {time.perf_counter() - started:.2f}s, "
+          f"{statuses.get(429, 0)} refused with 429, {checks} bcrypt checks")
+    if checks > login_throttle.LOGIN_USER_FAILURES:
+        sys.exit("FAIL throttled attempts still reached bcrypt")
+    if login_throttle.check("203.0.113.7", USERNAME) is not None:
+        sys.exit("FAIL failures from one address locked the account for another")
+
+async def run(args):
+    transport = httpx.ASGITransport(app=main.app)
+    async with main.app.router.lifespan_context(main.app), \
+            httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        login = await client.post("/login", data={"username": USERNAME, "password": PASSWORD})
+        client.cookies.set("access_token", login.cookies["access_token"])
+
+        for workers in (0, args.workers):
+            await storm(client, workers, args.logins, args.requests)
+        await brute_force(client, args.attempts)
+
+def main_():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=12, help="concurrent logins")
+    parser.add_argument("--requests", type=int, default=20, help="dashboard requests to time")
+    parser.add_argument("--workers", type=int, default=auth.PASSWORD_WORKERS or 2)
+    parser.add_argument("--attempts", type=int, default=50, help="wrong-password logins for the throttle check")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main_()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Latency of other routes while report PDFs are rendering.
+
+Drives the app in-process: keeps --pdfs report downloads in flight and meanwhile
+requests /dashboard --requests times, then prints p50/p95/p99 dashboard latency with
+PDFs rendered inline on the event loop (PDF_WORKERS=0) and in the process pool.
+Needs WeasyPrint and at least one completed order in the configured database.
+
+    python scripts/bench_pdf_pool.py --pdfs 4 --requests 100
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Every download must really render, so keep nothing in the PDF cache
+os.environ["PDF_CACHE_MAX_MB"] = "0"
+
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+
+import crud
+import main
+import pdf_renderer
+from database import SessionLocal
+from utils import WEASYPRINT_AVAILABLE
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+async def run(workers, order_ids, pdfs, requests):
+    # The app's lifespan starts the PDF pool (and stops it again afterwards)
+    pdf_renderer.PDF_WORKERS = workers
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with main.app.router.lifespan_context(main.app), \
+            httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        login = await client.post("/login", data={
+            "username": os.getenv("ADMIN_USERNAME", "admin"),
+            "password": os.getenv("ADMIN_PASSWORD", "admin123"),
+        })
+        client.cookies.set("access_token", login.cookies["access_token"])
+
+        done = asyncio.Event()
+        rendered = 0
+
+        async def download_loop(worker):
+            nonlocal rendered
+            i = worker
+            while not done.is_set():
+                await client.get(f"/reports/{order_ids[i % len(order_ids)]}/pdf")
+                rendered += 1
+                i += pdfs
+
+        downloads = [asyncio.create_task(download_loop(w)) for w in range(pdfs)]
+        await asyncio.sleep(0.2)
+
+        latencies = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            await client.get("/dashboard")
+            latencies.append((time.perf_counter() - started) * 1000)
+        done.set()
+        await asyncio.gather(*downloads)
+
+    mode = "inline" if workers == 0 else f"pool({workers})"
+    print(f"{mode:>10}: dashboard p50={percentile(latencies, 50):.1f}ms "
+          f"p95={percentile(latencies, 95):.1f}ms p99={percentile(latencies, 99):.1f}ms "
+          f"while {rendered} PDFs rendered")
+
+def main_():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pdfs", type=int, default=4, help="concurrent PDF downloads")
+    parser.add_argument("--requests", type=int, default=100, help="dashboard requests to time")
+    parser.add_argument("--workers", type=int, default=pdf_renderer.PDF_WORKERS or 2)
+    args = parser.parse_args()
+
+    if not WEASYPRINT_AVAILABLE:
+        sys.exit("WeasyPrint is not available; nothing to benchmark")
+    db = SessionLocal()
+    try:
+        order_ids = [o.id for o in crud.get_orders(db, limit=50, status="completed")]
+    finally:
+        db.close()
+    if not order_ids:
+        sys.exit("No completed orders in the database")
+
+    for workers in (0, args.workers):
+        asyncio.run(run(workers, order_ids, args.pdfs, args.requests))
+
+if __name__ == "__main__":
+    main_()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Microbenchmark for report template rendering.
+
+Compares compiling the report template on every call (what utils.py used to do with
+an inline jinja2.Template) against the shared precompiled environment, for a report
+with --items result rows. Only the HTML rendering is timed, not WeasyPrint.
+
+    python scripts/bench_report_render.py --items 40 --runs 500
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jinja2 import Template
+
+import utils
+
+def fake_order(items: int):
+    patient = SimpleNamespace(id=1, name="Benchmark Patient", age=42, gender="Female", phone="0300-1234567")
+    rows = [
+        SimpleNamespace(
+            id=i, result_value=f"{i}.5", result_notes=None,
+            test=SimpleNamespace(name=f"Parameter {i}", unit="mg/dL", reference_range="70-100")
+        )
+        for i in range(items)
+    ]
+    return SimpleNamespace(id=1, ordered_at=datetime.utcnow(), referred_by=None,
+                           status="completed", patient=patient, items=rows)
+
+def per_call_compile(order):
+    # Inline the includes so the per-call Template sees the same markup
+    loader = utils.report_env.loader
+    source, _, _ = loader.get_source(utils.report_env, utils.REPORT_TEMPLATE)
+    for name in utils.REPORT_TEMPLATE_FILES[1:]:
+        css, _, _ = loader.get_source(utils.report_env, name)
+        source = source.replace('{% include "' + name + '" %}', css)
+    return Template(source).render(order=order, screen=False)
+
+def time_it(func, order, runs):
+    func(order)  # warm up
+    started = time.perf_counter()
+    for _ in range(runs):
+        func(order)
+    return (time.perf_counter() - started) / runs * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=40)
+    parser.add_argument("--runs", type=int, default=500)
+    args = parser.parse_args()
+
+    order = fake_order(args.items)
+    compiled = time_it(per_call_compile, order, args.runs)
+    cached = time_it(utils.render_report, order, args.runs)
+    print(f"{args.items}-item report, {args.runs} runs")
+    print(f"  compile per call : {compiled:.3f} ms/report")
+    print(f"  shared template  : {cached:.3f} ms/report ({compiled / cached:.1f}x faster)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Concurrent result entry on SQLite, with SQLite's defaults and with database.py's pragmas.
+
+Starts --writers processes that each save one result per commit (like a counter
+entering results) and --readers processes paging through reports, all against a
+fresh database file, for --seconds. Run once with SQLITE_PRAGMAS=false and once with
+the WAL / synchronous=NORMAL / busy_timeout settings, then prints commits per second,
+commit latency (which includes waiting for the write lock) and "database is locked"
+failures for each.
+
+    python scripts/bench_sqlite_writers.py --writers 4 --readers 2 --seconds 10
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+def setup(orders, items_per_order):
+    # Runs in a child process so database.py picks up this mode's settings
+    from database import create_tables, engine
+    from models import Patient, Test, TestCategory, TestOrder, TestOrderItem
+
+    create_tables()
+    with engine.begin() as conn:
+        conn.execute(TestCategory.__table__.insert(), [{"id": 1, "name": "Benchmark"}])
+        conn.execute(Test.__table__.insert(), [
+            {"id": i, "name": f"Test {i}", "price": 100.0, "category_id": 1} for i in range(1, 51)
+        ])
+        conn.execute(Patient.__table__.insert(), [
+            {"id": 1, "name": "Benchmark Patient", "age": 40, "gender": "Female", "phone": "0300-0000000"}
+        ])
+        conn.execute(TestOrder.__table__.insert(), [
+            {"id": i, "patient_id": 1, "total_amount": 100.0 * items_per_order, "status": "completed"}
+            for i in range(1, orders + 1)
+        ])
+        conn.execute(TestOrderItem.__table__.insert(), [
+            {"order_id": i // items_per_order + 1, "test_id": i % 50 + 1}
+            for i in range(orders * items_per_order)
+        ])
+
+def writer(seed, item_count, seconds, results):
+    import crud
+    import schemas
+    from database import SessionLocal
+    from sqlalchemy.exc import OperationalError
+
+    rng = random.Random(seed)
+    latencies, locked = [], 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        db = SessionLocal()
+        started = time.perf_counter()
+        try:
+            crud.update_order_item_result(db, rng.randint(1, item_count), schemas.TestOrderItemUpdate(
+                result_value=f"{rng.uniform(0.1, 200):.1f}", result_notes=None))
+            latencies.append((time.perf_counter() - started) * 1000)
+        except OperationalError as e:
+            if "locked" not in str(e):
+                raise
+            locked += 1
+        finally:
+            db.close()
+    results.put(("writer", latencies, locked))
+
+def reader(seed, seconds, results):
+    import crud
+    from database import SessionLocal
+    from sqlalchemy.exc import OperationalError
+
+    latencies, locked = [], 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        db = SessionLocal()
+        started = time.perf_counter()
+        try:
+            page = crud.get_orders_page(db, limit=20, status="completed", with_items=True)
+            [len(order.items) for order in page["items"]]
+            latencies.append((time.perf_counter() - started) * 1000)
+        except OperationalError as e:
+            if "locked" not in str(e):
+                raise
+            locked += 1
+        finally:
+            db.close()
+    results.put(("reader", latencies, locked))
+
+def run_mode(name, env, args):
+    context = multiprocessing.get_context("spawn")
+    directory = tempfile.mkdtemp(prefix="bench_sqlite_")
+    os.environ.update(env, DATABASE_URL=f"sqlite:///{os.path.join(directory, 'lms.db')}")
+
+    process = context.Process(target=setup, args=(args.orders, args.items_per_order))
+    process.start()
+    process.join()
+
+    results = context.Queue()
+    processes = [
+        context.Process(target=writer, args=(i, args.orders * args.items_per_order, args.seconds, results))
+        for i in range(args.writers)
+    ] + [
+        context.Process(target=reader, args=(i, args.seconds, results)) for i in range(args.readers)
+    ]
+    for process in processes:
+        process.start()
+    collected = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    writes = [ms for kind, latencies, _ in collected if kind == "writer" for ms in latencies]
+    reads = [ms for kind, latencies, _ in collected if kind == "reader" for ms in latencies]
+    write_locked = sum(locked for kind, _, locked in collected if kind == "writer")
+    read_locked = sum(locked for kind, _, locked in collected if kind == "reader")
+    print(f"{name}:")
+    print(f"  writes : {len(writes) / args.seconds:8.1f} commits/s  p50={percentile(writes, 50):.1f}ms "
+          f"p99={percentile(writes, 99):.1f}ms max={max(writes, default=0):.0f}ms  locked={write_locked}")
+    if args.readers:
+        print(f"  reads  : {len(reads) / args.seconds:8.1f} pages/s    p50={percentile(reads, 50):.1f}ms "
+              f"p99={percentile(reads, 99):.1f}ms max={max(reads, default=0):.0f}ms  locked={read_locked}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--items-per-order", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{args.writers} writers, {args.readers} readers, {args.seconds:.0f} s per mode")
+    run_mode("SQLite defaults (rollback journal, synchronous=FULL)", {"SQLITE_PRAGMAS": "false"}, args)
+    run_mode("database.py pragmas (WAL, synchronous=NORMAL, busy_timeout)", {"SQLITE_PRAGMAS": "true"}, args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Startup time of the app, as a gunicorn worker sees it.
+
+Each run is a fresh Python process that imports main.py (which must not touch the
+database) and then runs the app's lifespan startup, reporting the per-phase timings
+it records. Runs --workers such processes at once against a fresh SQLite database
+(cold: tables and admin created) and then again against the same database (warm),
+so the startup lock and the admin-user race are exercised too. Prints JSON and exits
+with status 1 if any worker fails or takes longer than --max-seconds.
+
+    python scripts/bench_startup.py --workers 4 --max-seconds 5
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+
+def worker():
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    # Any statement on any engine while main.py is imported is import-time DB work
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(Engine, "before_cursor_execute", listener)
+    started = time.perf_counter()
+    import main
+    imported = time.perf_counter()
+    event.remove(Engine, "before_cursor_execute", listener)
+
+    async def start():
+        async with main.app.router.lifespan_context(main.app):
+            pass
+
+    asyncio.run(start())
+    print(json.dumps({
+        "import_s": round(imported - started, 3),
+        "statements_on_import": len(statements),
+        "phases": main.app.state.startup_timings,
+        "total_s": round(time.perf_counter() - started, 3),
+    }))
+
+def run_workers(count, env):
+    processes = [
+        subprocess.Popen([sys.executable, os.path.abspath(__file__), "--worker"], cwd=ROOT_DIR, env=env,
+                         stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        for _ in range(count)
+    ]
+    results = []
+    for process in processes:
+        out, err = process.communicate()
+        if process.returncode != 0:
+            results.append({"error": err.strip().splitlines()[-1] if err.strip() else "exit %d" % process.returncode})
+        else:
+            results.append(json.loads(out.strip().splitlines()[-1]))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4, help="processes starting at the same time")
+    parser.add_argument("--max-seconds", type=float, default=10, help="fail if a worker takes longer")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker()
+        return
+
+    directory = tempfile.mkdtemp(prefix="bench_startup_")
+    env = dict(os.environ,
+               DATABASE_URL=f"sqlite:///{os.path.join(directory, 'lms.db')}",
+               STARTUP_LOCK_FILE=os.path.join(directory, "startup.lock"),
+               PDF_WORKERS=os.environ.get("PDF_WORKERS", "1"))
+    report = {
+        "cold": run_workers(args.workers, env),
+        "warm": run_workers(args.workers, env),
+    }
+    print(json.dumps(report, indent=2))
+
+    failures = [
+        f"{phase} worker {i}: {result.get('error') or 'took %.2f s' % result['total_s']}"
+        for phase, results in report.items()
+        for i, result in enumerate(results)
+        if "error" in result or result["total_s"] > args.max_seconds or result["statements_on_import"]
+    ]
+    for failure in failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
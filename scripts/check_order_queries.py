@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Check that loading an order graph takes the same number of queries for any item count.
+
+Creates a 1-test and an 80-test order in a throwaway SQLite database (unless
+DATABASE_URL is set), then loads each with crud.get_order_graph, and both together
+with crud.get_order_graphs, touching everything the order page and reports read
+(patient, items, tests, and categories on the order page). Statements are counted with
+database.collect_queries; exits with status 1 if the counts differ.
+
+    python scripts/check_order_queries.py
+"""
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='check_order_'), 'lms.db')}"
+
+import catalog_seed
+import crud
+import schemas
+from database import SessionLocal, collect_queries, create_tables
+from models import Patient, Test
+
+SIZES = (1, 80)
+
+def touch(order, category):
+    # What order_detail.html reads; print runs skip the category
+    order.patient.name
+    for item in order.items:
+        item.result_value
+        item.test.name
+        if category:
+            item.test.category.name
+
+def count(load, category=True):
+    db = SessionLocal()
+    try:
+        with collect_queries() as stats:
+            for order in load(db):
+                touch(order, category)
+        return stats.count
+    finally:
+        db.close()
+
+def main():
+    create_tables()
+    catalog_seed.seed_catalog_files()
+    db = SessionLocal()
+    try:
+        patient = Patient(name="Query Check", age=40, gender="Female", phone="0300-0000000")
+        db.add(patient)
+        db.commit()
+        test_ids = [test_id for (test_id,) in db.query(Test.id).order_by(Test.id).limit(max(SIZES))]
+        if len(test_ids) < max(SIZES):
+            sys.exit(f"Need {max(SIZES)} tests in the catalog, found {len(test_ids)}")
+        order_ids = [
+            crud.create_order(db, schemas.TestOrderCreate(patient_id=patient.id, test_ids=test_ids[:size]))
+            for size in SIZES
+        ]
+    finally:
+        db.close()
+
+    counts = {
+        f"get_order_graph, {size} item{'s' if size > 1 else ''}":
+            count(lambda db, order_id=order_id: [crud.get_order_graph(db, order_id)])
+        for size, order_id in zip(SIZES, order_ids)
+    }
+    counts["get_order_graphs, both orders"] = count(
+        lambda db: crud.get_order_graphs(db, order_ids=order_ids, status=None), category=False
+    )
+    for name, queries in counts.items():
+        print(f"{name}: {queries} queries")
+
+    single = [queries for name, queries in counts.items() if name.startswith("get_order_graph,")]
+    if len(set(single)) != 1:
+        print("FAIL query count grows with the number of items", file=sys.stderr)
+        sys.exit(1)
+    if counts["get_order_graphs, both orders"] > single[0]:
+        print("FAIL get_order_graphs takes more queries than a single order", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Run EXPLAIN on every query the crud.py read paths issue and fail on full table scans.
+
+Each check calls the real crud function, captures the SQL it emits and explains it
+against the configured DATABASE_URL. On Postgres sequential scans are disabled for
+the EXPLAIN so a small table can't hide a missing index; on SQLite the query plan is
+checked for SCAN steps that don't use an index and for temp B-trees used for sorting.
+
+    python scripts/check_query_plans.py      # exit code 1 if any query scans
+"""
+import os
+import sys
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+from sqlalchemy import event
+
+load_dotenv()
+
+import crud
+from database import SessionLocal, create_tables, engine
+from models import AdminUser, Patient, Test, TestOrder
+
+def build_checks(db):
+    def first(column, default):
+        return db.query(column).limit(1).scalar() or default
+
+    order_id = first(TestOrder.id, 1)
+    patient_id = first(Patient.id, 1)
+    test_id = first(Test.id, 1)
+    username = first(AdminUser.username, "admin")
+    cursor = crud.encode_cursor(first(TestOrder.ordered_at, datetime.utcnow()), order_id)
+    patient_cursor = crud.encode_cursor(first(Patient.created_at, datetime.utcnow()), patient_id)
+
+    # get_catalog and get_dashboard_stats read whole tables by design (cached /
+    # counter-backed respectively), so they are not checked here
+    return [
+        ("get_admin_user", lambda: crud.get_admin_user(db, username)),
+        ("get_patients_page", lambda: crud.get_patients_page(db, limit=20)),
+        ("get_patients_page(after)", lambda: crud.get_patients_page(db, limit=20, after=patient_cursor)),
+        ("get_patients_page(before)", lambda: crud.get_patients_page(db, limit=20, before=patient_cursor)),
+        ("get_patients(search)", lambda: crud.get_patients(db, search="0300")),
+        ("get_patient", lambda: crud.get_patient(db, patient_id)),
+        ("get_test", lambda: crud.get_test(db, test_id)),
+        ("get_orders_page", lambda: crud.get_orders_page(db, limit=20)),
+        ("get_orders_page(after)", lambda: crud.get_orders_page(db, limit=20, after=cursor)),
+        ("get_orders_page(status=pending)", lambda: crud.get_orders_page(db, limit=20, status="pending")),
+        ("get_orders_page(status=completed, after)",
+         lambda: crud.get_orders_page(db, limit=20, status="completed", after=cursor, with_items=True)),
+        ("get_order", lambda: crud.get_order(db, order_id)),
+        ("get_order_graph", lambda: crud.get_order_graph(db, order_id)),
+    ]
+
+def capture(check):
+    statements = []
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        # Skip the one-off system catalog probes search.py makes
+        if "sqlite_master" not in statement and "pg_extension" not in statement:
+            statements.append((statement, parameters))
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        check()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    return statements
+
+def explain(conn, statement, parameters):
+    """Return a list of problems found in the plan (empty when the query is index-only)"""
+    problems = []
+    if engine.dialect.name == "postgresql":
+        conn.exec_driver_sql("SET enable_seqscan = off")
+        plan = [row[0] for row in conn.exec_driver_sql("EXPLAIN " + statement, parameters)]
+        conn.exec_driver_sql("RESET enable_seqscan")
+        problems = [line.strip() for line in plan if "Seq Scan" in line]
+    else:
+        plan = [row[3] for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)]
+        for detail in plan:
+            if detail.startswith("SCAN") and "INDEX" not in detail:
+                problems.append(detail)
+            elif "TEMP B-TREE" in detail:
+                problems.append(detail)
+    return problems
+
+def main():
+    create_tables()
+    db = SessionLocal()
+    failures = 0
+    try:
+        with engine.connect() as conn:
+            for name, check in build_checks(db):
+                for statement, parameters in capture(check):
+                    problems = explain(conn, statement, parameters)
+                    status = "FAIL" if problems else "ok"
+                    print(f"[{status}] {name}: {' '.join(statement.split())[:100]}")
+                    for problem in problems:
+                        print(f"         {problem}")
+                    failures += bool(problems)
+    finally:
+        db.close()
+
+    print(f"\n{failures} quer{'y' if failures == 1 else 'ies'} fell back to a full scan")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Export test results as CSV or JSON Lines, streamed straight from the database.
+
+One row per order item, joined with its order, patient, test and category. Rows are
+read from a server-side cursor in --batch-size chunks and written as they arrive,
+so memory stays flat however many orders the range covers.
+
+    python scripts/export_results.py --from 2025-01-01 --to 2025-03-31 -o q1.csv
+    python scripts/export_results.py --format jsonl --category 3 > haematology.jsonl
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+import crud
+import exports
+from database import SessionLocal
+
+def parse_date(value):
+    return datetime.strptime(value, "%Y-%m-%d")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--format", choices=sorted(exports.FORMATS), default="csv")
+    parser.add_argument("--from", dest="date_from", type=parse_date, help="first day (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="date_to", type=parse_date, help="last day, inclusive (YYYY-MM-DD)")
+    parser.add_argument("--category", type=int, help="only tests in this category id")
+    parser.add_argument("--status", help="only orders with this status")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("-o", "--output", help="output file (default stdout)")
+    args = parser.parse_args()
+
+    formatter, _ = exports.FORMATS[args.format]
+    rows = 0
+
+    def counted(batches):
+        nonlocal rows
+        for batch in batches:
+            rows += len(batch)
+            yield batch
+
+    started = time.perf_counter()
+    out = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    db = SessionLocal()
+    try:
+        batches = crud.iter_order_results(
+            db,
+            date_from=args.date_from,
+            date_to=args.date_to + timedelta(days=1) if args.date_to else None,
+            category_id=args.category,
+            status=args.status,
+            batch_size=args.batch_size
+        )
+        for chunk in formatter(counted(batches)):
+            out.write(chunk)
+    finally:
+        db.close()
+        if args.output:
+            out.close()
+
+    print(f"Exported {rows} rows in {time.perf_counter() - started:.1f} s", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
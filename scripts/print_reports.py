@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Print run: render many completed reports into one merged, paginated PDF.
+
+All orders are loaded with one bulk query and laid out by WeasyPrint in a single
+pass, so CSS and fonts are processed once for the whole run.
+
+    python scripts/print_reports.py --from 2025-01-06 --to 2025-01-06 -o shift.pdf
+    python scripts/print_reports.py --ids 101 102 107 -o reprint.pdf
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+import crud
+from database import SessionLocal
+from utils import WEASYPRINT_AVAILABLE, generate_batch_pdf
+
+def parse_date(value):
+    return datetime.strptime(value, "%Y-%m-%d")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--from", dest="date_from", type=parse_date, help="first day completed (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="date_to", type=parse_date, help="last day completed, inclusive (YYYY-MM-DD)")
+    parser.add_argument("--ids", type=int, nargs="+", help="order ids to print")
+    parser.add_argument("-o", "--output", help="output file (default reports_<from>-<to>.pdf)")
+    args = parser.parse_args()
+
+    if not args.ids and not args.date_from and not args.date_to:
+        parser.error("give --from/--to or --ids")
+
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        orders = crud.get_order_graphs(
+            db,
+            order_ids=args.ids,
+            date_from=args.date_from,
+            date_to=args.date_to + timedelta(days=1) if args.date_to else None
+        )
+        if not orders:
+            print("No completed orders found.")
+            return
+        loaded = time.perf_counter()
+        content = generate_batch_pdf(orders)
+    finally:
+        db.close()
+    rendered = time.perf_counter()
+
+    extension = "pdf" if WEASYPRINT_AVAILABLE else "html"
+    output = args.output or f"reports_{orders[0].id}-{orders[-1].id}.{extension}"
+    with open(output, "wb") as f:
+        f.write(content)
+
+    print(f"Wrote {len(orders)} reports to {output}")
+    print(f"  load   : {(loaded - started) * 1000:.0f} ms")
+    print(f"  render : {(rendered - loaded) * 1000:.0f} ms ({(rendered - loaded) * 1000 / len(orders):.1f} ms/report)")
+    if not WEASYPRINT_AVAILABLE:
+        print("  (WeasyPrint not available: wrote printable HTML instead)")
+
+if __name__ == "__main__":
+    main()
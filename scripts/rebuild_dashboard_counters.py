@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""Recount the dashboard totals and store them in dashboard_counters.
+
+With DASHBOARD_COUNTERS=true the dashboard reads stored counters that writes keep
+up to date. Rows changed while the option was off, or outside the app, leave them
+wrong; the app recounts at startup, and this script does the same on demand.
+
+    DASHBOARD_COUNTERS=true python scripts/rebuild_dashboard_counters.py
+"""
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+import crud
+from database import SessionLocal
+
+def main():
+    db = SessionLocal()
+    try:
+        stats = crud.rebuild_dashboard_counters(db)
+    finally:
+        db.close()
+    for name, value in stats.items():
+        print(f"{name}: {value}")
+    if not crud.DASHBOARD_COUNTERS:
+        print("Note: DASHBOARD_COUNTERS is off, so the app doesn't read or update these counters")
+
+if __name__ == "__main__":
+    main()
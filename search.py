@@ -0,0 +1,112 @@
+from typing import List
+
+from sqlalchemy import func, or_, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from models import Patient
+
+# Patient search backends.
+# Postgres: pg_trgm GIN indexes on name/phone serve ILIKE '%term%' and rank by similarity().
+# SQLite: an FTS5 trigram table (patients_fts) shadows patients and is kept in sync by triggers.
+# Anything else, or a database where the index is missing, falls back to a LIKE scan.
+
+# Trigram indexes cannot match terms shorter than three characters
+MIN_INDEXED_TERM = 3
+
+SQLITE_FTS_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS patients_fts USING fts5(
+        name, phone, content='patients', content_rowid='id', tokenize='trigram'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS patients_fts_ai AFTER INSERT ON patients BEGIN
+        INSERT INTO patients_fts(rowid, name, phone) VALUES (new.id, new.name, new.phone);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS patients_fts_ad AFTER DELETE ON patients BEGIN
+        INSERT INTO patients_fts(patients_fts, rowid, name, phone) VALUES ('delete', old.id, old.name, old.phone);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS patients_fts_au AFTER UPDATE OF name, phone ON patients BEGIN
+        INSERT INTO patients_fts(patients_fts, rowid, name, phone) VALUES ('delete', old.id, old.name, old.phone);
+        INSERT INTO patients_fts(rowid, name, phone) VALUES (new.id, new.name, new.phone);
+    END""",
+]
+
+# Whether the search index exists, cached per engine URL
+_index_available = {}
+
+def ensure_search_index(engine):
+    """Create the SQLite FTS table and triggers if missing (Postgres indexes come from Alembic)"""
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.begin() as conn:
+        exists = conn.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'patients_fts'"
+        )).first()
+        try:
+            for statement in SQLITE_FTS_DDL:
+                conn.execute(text(statement))
+        except DBAPIError:
+            # SQLite older than 3.34 has no trigram tokenizer; keep the LIKE fallback
+            _index_available[str(engine.url)] = False
+            return
+        if not exists:
+            conn.execute(text("INSERT INTO patients_fts(patients_fts) VALUES ('rebuild')"))
+    _index_available[str(engine.url)] = True
+
+def _has_index(db: Session) -> bool:
+    engine = db.get_bind()
+    key = str(engine.url)
+    if key not in _index_available:
+        if engine.dialect.name == "postgresql":
+            found = db.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")).first()
+        elif engine.dialect.name == "sqlite":
+            found = db.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'patients_fts'"
+            )).first()
+        else:
+            found = None
+        _index_available[key] = found is not None
+    return _index_available[key]
+
+def _like_search(db: Session, term: str, limit: int) -> List[Patient]:
+    return (db.query(Patient)
+            .filter(or_(
+                Patient.name.contains(term, autoescape=True),
+                Patient.phone.contains(term, autoescape=True)
+            ))
+            .order_by(Patient.created_at.desc(), Patient.id.desc())
+            .limit(limit).all())
+
+def _postgres_search(db: Session, term: str, limit: int) -> List[Patient]:
+    pattern = "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+    rank = func.greatest(func.similarity(Patient.name, term), func.similarity(Patient.phone, term))
+    return (db.query(Patient)
+            .filter(or_(Patient.name.ilike(pattern), Patient.phone.ilike(pattern)))
+            .order_by(rank.desc(), Patient.id.desc())
+            .limit(limit).all())
+
+def _sqlite_search(db: Session, term: str, limit: int) -> List[Patient]:
+    # A quoted FTS5 string is matched as a literal substring by the trigram tokenizer
+    match = '"' + term.replace('"', '""') + '"'
+    ids = [row[0] for row in db.execute(
+        text("SELECT rowid FROM patients_fts WHERE patients_fts MATCH :match ORDER BY rank LIMIT :limit"),
+        {"match": match, "limit": limit}
+    )]
+    if not ids:
+        return []
+    position = {patient_id: i for i, patient_id in enumerate(ids)}
+    patients = db.query(Patient).filter(Patient.id.in_(ids)).all()
+    return sorted(patients, key=lambda p: position[p.id])
+
+def search_patients(db: Session, term: str, limit: int = 100) -> List[Patient]:
+    """Return patients whose name or phone contains term, best matches first"""
+    term = term.strip()
+    if not term:
+        return []
+    if len(term) < MIN_INDEXED_TERM or not _has_index(db):
+        return _like_search(db, term, limit)
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return _postgres_search(db, term, limit)
+    if dialect == "sqlite":
+        return _sqlite_search(db, term, limit)
+    return _like_search(db, term, limit)
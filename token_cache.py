@@ -0,0 +1,107 @@
+import calendar
+import hashlib
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, NamedTuple, Optional
+
+import crud
+from auth import decode_token
+from database import SessionLocal
+
+# In-process cache of verified access tokens, and the token revocation list.
+# A token that verified once is recognised by its sha256 digest until
+# TOKEN_CACHE_TTL seconds have passed or it expires, whichever is first, instead of
+# checking the JWT signature on every request. /logout stores the digest in
+# revoked_tokens; the worker that handled it drops the token at once, and every
+# worker reloads the unexpired revocations at most TOKEN_REVOCATION_SYNC seconds
+# apart. The whole list is reloaded rather than only rows above the last id seen:
+# on PostgreSQL ids come from a sequence before commit, so a revocation can become
+# visible after one with a higher id. The list only holds tokens that logged out
+# before expiring, so it stays small. Both checks are dict lookups.
+TOKEN_CACHE_TTL = float(os.getenv("TOKEN_CACHE_TTL", "300"))
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+TOKEN_REVOCATION_SYNC = float(os.getenv("TOKEN_REVOCATION_SYNC", "5"))
+
+class CachedToken(NamedTuple):
+    username: str
+    valid_until: float
+
+_lock = threading.Lock()
+_tokens: Dict[str, CachedToken] = {}
+_revoked: Dict[str, float] = {}
+_synced_at: Optional[float] = None
+_hits = 0
+_misses = 0
+
+def token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+def _timestamp(value: datetime) -> float:
+    return calendar.timegm(value.utctimetuple())
+
+def _sync_revocations():
+    global _revoked, _synced_at
+    if _synced_at is not None and time.monotonic() - _synced_at < TOKEN_REVOCATION_SYNC:
+        return
+    with _lock:
+        # Another thread may have synced while we waited for the lock
+        if _synced_at is not None and time.monotonic() - _synced_at < TOKEN_REVOCATION_SYNC:
+            return
+        db = SessionLocal()
+        try:
+            rows = crud.get_revoked_tokens(db)
+        finally:
+            db.close()
+        revoked = {digest: _timestamp(expires_at) for digest, expires_at in rows}
+        for digest in revoked.keys() - _revoked.keys():
+            _tokens.pop(digest, None)
+        _revoked = revoked
+        _synced_at = time.monotonic()
+
+def verify(token: str) -> Optional[str]:
+    """Username of a valid, unrevoked token, or None"""
+    global _hits, _misses
+    digest = token_digest(token)
+    _sync_revocations()
+    if digest in _revoked:
+        return None
+
+    cached = _tokens.get(digest)
+    if cached is not None and time.time() < cached.valid_until:
+        _hits += 1
+        return cached.username
+
+    _misses += 1
+    payload = decode_token(token)
+    if payload is None:
+        return None
+    now = time.time()
+    valid_until = min(now + TOKEN_CACHE_TTL, float(payload.get("exp", now + TOKEN_CACHE_TTL)))
+    with _lock:
+        if digest not in _tokens and len(_tokens) >= TOKEN_CACHE_SIZE:
+            # Drop the oldest entry (dicts keep insertion order)
+            _tokens.pop(next(iter(_tokens)), None)
+        _tokens[digest] = CachedToken(payload["sub"], valid_until)
+    return payload["sub"]
+
+def revoke(token: str):
+    """Invalidate a token everywhere before it expires"""
+    payload = decode_token(token)
+    if payload is None:
+        # Invalid or expired already
+        return
+    digest = token_digest(token)
+    expires_at = datetime.utcfromtimestamp(payload["exp"]) if "exp" in payload else datetime.max
+    db = SessionLocal()
+    try:
+        crud.revoke_token(db, digest, expires_at)
+    finally:
+        db.close()
+    with _lock:
+        _revoked[digest] = _timestamp(expires_at)
+        _tokens.pop(digest, None)
+
+def stats() -> dict:
+    return {"hits": _hits, "misses": _misses, "cached_tokens": len(_tokens), "revoked": len(_revoked)}